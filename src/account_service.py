@@ -5,13 +5,84 @@
 
 from datetime import datetime
 from decimal import Decimal
+import copy
 import os
 from dateutil.relativedelta import relativedelta
-from . import config
-from .utils import generate_id, save_json, load_json, parse_datetime
+from . import config, credit_index
+from .utils import (generate_id, reserve_ids, save_json, load_json, parse_datetime, batched_writes, append_json_lines,
+                    load_json_lines, iter_file_contents, on_write_error)
 from .customer_service import get_customer
 from .ledger_service import update_bank_ledger
 
+# In-Memory-Kontoverzeichnis, damit nicht bei jedem Aufruf ACCOUNTS_DIR durchsucht werden muss
+# Wird beim ersten Zugriff einmalig per os.scandir aufgebaut und danach von save_account gepflegt
+_regular_accounts = None      # set: IDs der regulären Konten (CH-...)
+_credit_accounts = None       # set: IDs der Kreditkonten (CRCH-...)
+_customer_to_account = None   # dict: customer_id -> account_id des regulären Kontos
+
+# Zwischenspeicher bereits gelesener Konten (account_id -> Kontodaten)
+# Wird von save_account nachgeführt (write-through); get_account gibt immer eine Kopie zurück.
+# Gilt nur für einen Lauf: clear_account_cache leert ihn zu Beginn jeder Transaktionsdatei und
+# jedes Zeitereignisses, damit Änderungen an Kontodateien ausserhalb des Prozesses sichtbar werden
+_account_cache = {}
+
+def _copy_account(account_data):
+    """
+    Kopiert Kontodaten für _account_cache bzw. für den Aufrufer von get_account.
+    
+    Hinweis:
+        - Verschachtelte Werte (Listen, Dictionaries, z.B. Alt-Historien) werden tief kopiert,
+          damit Zwischenspeicher und Aufrufer sich keine veränderbaren Objekte teilen
+        - Alle übrigen Werte (str, int, Decimal, None) sind unveränderlich und werden übernommen;
+          das hält die Kopie für die üblichen flachen Konten fast so billig wie dict()
+    """
+    return {key: copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+            for key, value in account_data.items()}
+
+# Verzeichnispräfix für Kontodateien, einmal beim Import gebildet
+# (Pfade entstehen damit durch einfache String-Verkettung statt os.path.join pro Aufruf)
+_ACCOUNTS_DIR_PREFIX = config.ACCOUNTS_DIR + os.sep
+
+def clear_account_cache():
+    """
+    Leert _account_cache zu Beginn eines Laufs (Transaktionsdatei oder Zeitereignis).
+    
+    Hinweis:
+        Der Zwischenspeicher wächst damit höchstens auf die Konten eines Laufs, und ausserhalb
+        des Prozesses geänderte Kontodateien werden im nächsten Lauf neu gelesen
+    """
+    _account_cache.clear()
+
+def _forget_unsaved_account(file_path):
+    """
+    Entfernt ein Konto aus _account_cache, dessen Datei nicht geschrieben werden konnte.
+    
+    Hinweis:
+        Wird über on_write_error aufgerufen (auch für Schreibfehler beim Verlassen von batched_writes);
+        sonst sähe save_account den nie geschriebenen Stand als gespeichert an und würde ihn nicht erneut schreiben
+    """
+    if file_path.startswith(_ACCOUNTS_DIR_PREFIX) and file_path.endswith('.json'):
+        _account_cache.pop(file_path[len(_ACCOUNTS_DIR_PREFIX):-5], None)
+
+on_write_error(_forget_unsaved_account)
+
+# Einmal erzeugte Decimal-Konstante (Decimal ist unveränderlich und kann geteilt werden)
+_ZERO_DEC = Decimal('0.00')
+
+# Vorlage für Gebührentransaktionen (Schlüsselreihenfolge wie im gespeicherten Datensatz)
+# process_quarterly_fees kopiert sie pro Konto und setzt nur die variablen Felder
+_FEE_TX_TEMPLATE = {
+    "transaction_id": None,
+    "type": "quarterly_fee",
+    "account": None,
+    "amount": None,
+    "timestamp": None,
+    "status": "completed",
+    "balance_before": None,
+    "balance_after": None,
+    "reason": ""
+}
+
 
 def create_account(customer_id):
     """
@@ -48,14 +119,13 @@ def create_account(customer_id):
     account_data = {
         "account_id": account_id,
         "customer_id": customer_id,
-        "balance": Decimal("0.00"),
+        "balance": _ZERO_DEC,
         "status": "active",  # Mögliche Status: 'active', 'blocked', 'closed'
         "created_at": now_iso,
-        "last_fee_date": system_date_iso,  # Initialisierung des Gebührendatums
-        "transactions": []  # Transaktionshistorie
+        "last_fee_date": system_date_iso  # Initialisierung des Gebührendatums
+        # Transaktionshistorie liegt separat in <account_id>.tx.jsonl (siehe add_transaction_to_account)
     }
-    account_file_path = os.path.join(config.ACCOUNTS_DIR, f"{account_id}.json")
-    save_json(account_file_path, account_data)
+    save_account(account_data)
     print(f"Regular account created: {account_id}")
 
     # Zugehöriges Kreditkonto erstellen (initialisiert aber inaktiv)
@@ -63,63 +133,180 @@ def create_account(customer_id):
     credit_account_data = {
         "account_id": credit_account_id,
         "customer_id": customer_id,
-        "balance": Decimal("0.00"),  # Ausstehender Kreditbetrag
+        "balance": _ZERO_DEC,  # Ausstehender Kreditbetrag
         "status": "inactive",  # Mögliche Status: 'inactive', 'active', 'paid_off', 'blocked', 'written_off'
         "created_at": now_iso,
         "credit_start_date": None,  # Wird bei Kreditvergabe gesetzt
         "credit_end_date": None,    # Wird bei Kreditvergabe gesetzt
-        "original_amount": Decimal("0.00"),  # Ursprünglicher Kreditbetrag
-        "monthly_payment": Decimal("0.00"),  # Monatliche Rate
+        "original_amount": _ZERO_DEC,  # Ursprünglicher Kreditbetrag
+        "monthly_payment": _ZERO_DEC,  # Monatliche Rate
         "monthly_rate": config.CREDIT_MONTHLY_RATE,  # Monatlicher Zinssatz
         "remaining_payments": 0,  # Verbleibende Zahlungen
-        "amortization_schedule": [],  # Tilgungsplan
-        "transactions": [],  # Transaktionshistorie
         "missed_payments_count": 0,  # Zählt aufeinanderfolgende versäumte Zahlungen
         "last_payment_attempt_date": None,  # Datum des letzten Zahlungsversuchs
-        "penalty_accrued": Decimal("0.00")  # Aufgelaufene Strafen während Blockierung
+        "penalty_accrued": _ZERO_DEC  # Aufgelaufene Strafen während Blockierung
     }
-    credit_account_file_path = os.path.join(config.ACCOUNTS_DIR, f"{credit_account_id}.json")
-    save_json(credit_account_file_path, credit_account_data)
+    save_account(credit_account_data)
     print(f"Associated credit account created: {credit_account_id}")
 
     return account_data, credit_account_data
 
-def get_account(account_id):
+# Felder, die im Kontodokument als Decimal vorliegen müssen
+_DECIMAL_FIELDS = frozenset(('balance', 'original_amount', 'monthly_payment', 'penalty_accrued'))
+# Zählerfelder, die als int vorliegen müssen (ältere Datenbestände enthalten sie teils als String)
+_INT_FIELDS = frozenset(('remaining_payments', 'missed_payments_count'))
+
+def _account_object_hook(obj):
+    """
+    Wandelt die Betragsfelder eines geladenen Kontos in Decimal und die Zähler in int um
+    (siehe _load_account_fast).
+    
+    Hinweis:
+        - Als String gespeicherte Beträge werden zu Decimal, None bleibt None
+        - Nicht umwandelbare Beträge werden mit Warnung auf None gesetzt
+        - Nicht umwandelbare Zähler werden mit Warnung auf 0 gesetzt; da save_account das Konto
+          danach mit int-Zählern schreibt, werden ältere Dateien dabei nebenbei bereinigt
+    """
+    for field in obj.keys() & _DECIMAL_FIELDS:
+        value = obj[field]
+        if value is None or isinstance(value, Decimal):
+            continue
+        try:
+            obj[field] = Decimal(value if isinstance(value, str) else str(value))
+        except Exception as e:
+            print(f"Warning: Could not convert field '{field}' with value '{value}' to Decimal for account {obj.get('account_id')}. Error: {e}")
+            obj[field] = None
+    for field in obj.keys() & _INT_FIELDS:
+        value = obj[field]
+        if type(value) is int:
+            continue
+        try:
+            obj[field] = int(value)
+        except (ValueError, TypeError):
+            print(f"Warning: Could not convert field '{field}' with value '{value}' to int for account {obj.get('account_id')}. Defaulting to 0.")
+            obj[field] = 0
+    return obj
+
+def _load_account_fast(file_path, drop_cache=False, content=None):
+    """
+    Lädt eine Kontodatei und wandelt die Betragsfelder in Decimal um.
+    
+    Hinweis:
+        - Beträge stehen in Kontodateien als String, daher wird ohne Decimal-Zahlen geparst
+          (über orjson falls installiert) und nur die Betragsfelder der obersten Ebene umgewandelt;
+          Zähler wie remaining_payments sind danach int
+        - drop_cache=True für Massendurchläufe, damit die einmal gelesenen Kontodateien
+          nicht den Page-Cache für Hauptbuch und Systemdatum verdrängen
+        - content: bereits gelesener Dateiinhalt (siehe iter_file_contents)
+    """
+    account_data = load_json(file_path, drop_cache=drop_cache, decimal_numbers=False, content=content)
+    if account_data is None:
+        return None
+    return _account_object_hook(account_data)
+
+def get_account(account_id, cache=True):
     """
     Ruft Kontoinformationen ab (reguläres oder Kreditkonto).
     
     Args:
         account_id (str): ID des Kontos
+        cache (bool): Von der Platte gelesene Konten in _account_cache aufnehmen
+                      (False für einmalige Prüf-Lesezugriffe in Massendurchläufen)
         
     Returns:
         dict/None: Kontodaten oder None wenn nicht gefunden
         
     Hinweis:
-        Stellt sicher, dass der Kontostand als Decimal-Objekt zurückgegeben wird
+        - Stellt sicher, dass der Kontostand als Decimal-Objekt zurückgegeben wird
+        - Bereits gelesene Konten kommen aus _account_cache; der Aufrufer erhält eine eigene
+          Kopie und kann sie wie bisher ändern, ohne den Zwischenspeicher zu verfälschen
     """
-    file_path = os.path.join(config.ACCOUNTS_DIR, f"{account_id}.json")
-    account_data = load_json(file_path)
+    cached = _account_cache.get(account_id)
+    if cached is not None:
+        return _copy_account(cached)
+    # Decimal-Felder werden direkt beim Parsen über den object_hook konvertiert
+    account_data = _load_account_fast(f"{_ACCOUNTS_DIR_PREFIX}{account_id}.json")
+    if account_data is not None and cache:
+        _account_cache[account_id] = _copy_account(account_data)
+    return account_data
+
+def get_accounts(account_ids, cache=True):
+    """
+    Ruft mehrere Konten ab; die Kontodateien werden dabei parallel vorausgelesen.
     
-    if account_data:
-        # Felder, die Decimal sein sollten, explizit konvertieren, falls sie als String geladen wurden
-        decimal_fields = ['balance', 'original_amount', 'monthly_payment', 'penalty_accrued']
-        for field in decimal_fields:
-            if field in account_data and isinstance(account_data[field], str):
-                try:
-                    account_data[field] = Decimal(account_data[field])
-                except Exception as e:
-                    print(f"Warning: Could not convert field '{field}' with value '{account_data[field]}' to Decimal for account {account_id}. Error: {e}")
-                    # Optional: Setze auf None oder einen Standard-Decimal-Wert, falls Konvertierung fehlschlägt
-                    account_data[field] = None # Oder Decimal('0.00') je nach Anforderung
-            elif field in account_data and not isinstance(account_data[field], Decimal) and account_data[field] is not None:
-                 # Fall: Es ist weder String noch Decimal (z.B. int oder float), versuche Konvertierung
-                try:
-                    account_data[field] = Decimal(str(account_data[field]))
-                except Exception as e:
-                    print(f"Warning: Could not convert non-string, non-decimal field '{field}' with value '{account_data[field]}' to Decimal for account {account_id}. Error: {e}")
-                    account_data[field] = None
+    Args:
+        account_ids (list): IDs der Konten
+        cache (bool): Wie bei get_account
+        
+    Yields:
+        tuple: (account_id, Kontodaten oder None) in der Reihenfolge von account_ids
+        
+    Hinweis:
+        - Nur das Lesen der Dateien läuft im Thread-Pool (siehe iter_file_contents); geparst und in
+          _account_cache aufgenommen wird im aufrufenden Thread, die Threads berühren also weder den
+          Zwischenspeicher noch Kontoverzeichnis oder Kundenindex
+        - Konten aus _account_cache werden nicht erneut von der Platte gelesen
+    """
+    read_from_disk = [account_id not in _account_cache for account_id in account_ids]
+    contents = iter_file_contents([f"{_ACCOUNTS_DIR_PREFIX}{account_id}.json"
+                                   for account_id, read in zip(account_ids, read_from_disk) if read])
+    for account_id, read in zip(account_ids, read_from_disk):
+        content = next(contents) if read else None
+        cached = _account_cache.get(account_id)
+        if cached is not None:
+            yield account_id, _copy_account(cached)
+            continue
+        # Ohne vorausgelesenen Inhalt liest _load_account_fast die Datei selbst
+        account_data = _load_account_fast(f"{_ACCOUNTS_DIR_PREFIX}{account_id}.json", content=content)
+        if account_data is not None and cache:
+            _account_cache[account_id] = _copy_account(account_data)
+        yield account_id, account_data
 
-    return account_data
+def _load_account_sets():
+    """
+    Baut die Mengen der regulären Konten und Kreditkonten beim ersten Aufruf auf.
+    
+    Hinweis:
+        - Ein einziger os.scandir-Durchlauf pro Prozess, danach nur noch Pflege über save_account
+        - Geschlossene Konten bleiben enthalten, da ihre Dateien bestehen bleiben
+        - Nur Dateien mit den Kontopräfixen 'CH-' bzw. 'CRCH-' zählen als Konten; andere
+          .json-Dateien im Kontoverzeichnis werden übersprungen (z.B. nicht vom Gebührenlauf belastet)
+    """
+    global _regular_accounts, _credit_accounts
+    if _regular_accounts is None:
+        regular, credit = set(), set()
+        with os.scandir(config.ACCOUNTS_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith('.json'):
+                    continue
+                if name.startswith('CH-'):
+                    regular.add(name[:-5])
+                elif name.startswith('CRCH-'):
+                    credit.add(name[:-5])
+        _regular_accounts, _credit_accounts = regular, credit
+
+def _get_customer_account_index():
+    """
+    Liefert den Index Kunde -> reguläres Konto und baut ihn beim ersten Aufruf auf.
+    
+    Returns:
+        dict: Zuordnung customer_id -> account_id
+        
+    Hinweis:
+        - Liest die regulären Kontodateien nur einmal pro Prozess
+        - Spätere Änderungen werden über save_account nachgeführt
+    """
+    global _customer_to_account
+    if _customer_to_account is None:
+        _load_account_sets()
+        index = {}
+        for account_id in _regular_accounts:
+            acc_data = load_json(f"{_ACCOUNTS_DIR_PREFIX}{account_id}.json")
+            if acc_data and acc_data.get('customer_id'):
+                index.setdefault(acc_data['customer_id'], acc_data.get('account_id', account_id))
+        _customer_to_account = index
+    return _customer_to_account
 
 def get_customer_account(customer_id):
     """
@@ -130,15 +317,14 @@ def get_customer_account(customer_id):
         
     Returns:
         dict/None: Kontodaten oder None wenn nicht gefunden
+        
+    Hinweis:
+        Verwendet den Kundenindex statt alle Kontodateien zu durchsuchen
     """
-    all_files = os.listdir(config.ACCOUNTS_DIR)
-    account_files = [f for f in all_files if f.endswith('.json') and not f.startswith('CR')]
-
-    for acc_file in account_files:
-        acc_data = load_json(os.path.join(config.ACCOUNTS_DIR, acc_file))
-        if acc_data and acc_data.get('customer_id') == customer_id:
-            return acc_data
-    return None
+    account_id = _get_customer_account_index().get(customer_id)
+    if not account_id:
+        return None
+    return get_account(account_id)
 
 def save_account(account_data):
     """
@@ -149,18 +335,52 @@ def save_account(account_data):
         
     Returns:
         bool: True bei Erfolg, False bei Fehler
+        
+    Hinweis:
+        - Einziger Weg, den Status eines Kreditkontos zu ändern: nur hier wird der Kreditindex
+          nachgeführt, den die Kreditläufe als alleinige Quelle verwenden (siehe credit_index)
+        - Entspricht das Konto dem zuletzt gelesenen bzw. geschriebenen Stand in _account_cache,
+          wird nichts geschrieben (z.B. Hauptkonto nach abgelehnter Kreditrate)
+        - _account_cache hält eigene Kopien (siehe _copy_account): auch direkt veränderte
+          verschachtelte Werte eines Kontos werden deshalb als Änderung erkannt
+        - Der Zwischenspeicher wird erst nach erfolgreichem Schreiben (bzw. Vormerken in
+          batched_writes) nachgeführt; ein fehlgeschlagener Stand wird beim nächsten Aufruf erneut geschrieben
     """
     if not account_data or 'account_id' not in account_data:
         print("Error: Invalid account data for saving.")
         return False
 
-    file_path = os.path.join(config.ACCOUNTS_DIR, f"{account_data['account_id']}.json")
-    save_json(file_path, account_data)
+    account_id = account_data['account_id']
+    if _account_cache.get(account_id) == account_data:
+        # Unveränderter Stand: Datei und Indizes sind bereits aktuell
+        return True
+    file_path = f"{_ACCOUNTS_DIR_PREFIX}{account_id}.json"
+    # Kontodateien werden sehr oft geschrieben und gelesen: kompakt statt eingerückt speichern
+    if not save_json(file_path, account_data, compact=True):
+        # _forget_unsaved_account hat den Eintrag im Zwischenspeicher bereits entfernt
+        return False
+    _account_cache[account_id] = _copy_account(account_data)
+
+    # Kontoverzeichnis und Kundenindex nachführen (nur falls bereits aufgebaut)
+    if account_id.startswith('CR'):
+        if _credit_accounts is not None:
+            _credit_accounts.add(account_id)
+        # Index der laufenden Kredite nachführen (Statuswechsel aktiv/gesperrt/abgeschlossen)
+        credit_index.add(account_id, account_data.get('status'))
+    else:
+        if _regular_accounts is not None:
+            _regular_accounts.add(account_id)
+        if _customer_to_account is not None and account_data.get('customer_id'):
+            _customer_to_account.setdefault(account_data['customer_id'], account_id)
     return True
 
+def _transaction_log_path(account_id):
+    """Pfad der Transaktionshistorie (JSON-Lines) eines Kontos."""
+    return f"{_ACCOUNTS_DIR_PREFIX}{account_id}.tx.jsonl"
+
 def add_transaction_to_account(account_data_param, transaction_data):
     """
-    Fügt einen Transaktionsdatensatz zur Kontohistorie hinzu.
+    Fügt einen Transaktionsdatensatz zur Kontohistorie hinzu und speichert das Konto.
     
     Args:
         account_data_param (dict): Kontodaten-Objekt
@@ -168,17 +388,44 @@ def add_transaction_to_account(account_data_param, transaction_data):
         
     Returns:
         bool: True bei Erfolg, False bei Fehler
+        
+    Hinweis:
+        - Die Transaktion wird an <account_id>.tx.jsonl angehängt statt in die Kontodatei eingebettet
+        - Eine noch eingebettete Historie (ältere Kontodateien) wird dabei einmalig ins Log übernommen
+        - Speichert das Konto danach selbst (save_account), ein weiterer Aufruf ist nicht nötig
     """
     if not account_data_param:
         print(f"Error: Invalid account_data provided to add_transaction_to_account.")
         return False
 
-    if 'transactions' not in account_data_param:
-        account_data_param['transactions'] = []
-
-    account_data_param['transactions'].append(transaction_data)
+    account_id = account_data_param['account_id']
+    legacy_transactions = account_data_param.pop('transactions', None) or []
+    if not append_json_lines(_transaction_log_path(account_id), legacy_transactions + [transaction_data]):
+        # False heisst: nichts geschrieben und nichts vorgemerkt, die Alt-Historie gehört zurück ins Konto
+        if legacy_transactions:
+            account_data_param['transactions'] = legacy_transactions
+        print(f"Error: Could not write transaction log for account {account_id}")
+        return False
     return save_account(account_data_param)
 
+def get_account_transactions(account_id):
+    """
+    Lädt die Transaktionshistorie eines Kontos.
+    
+    Args:
+        account_id (str): ID des Kontos
+        
+    Returns:
+        list: Transaktionen in chronologischer Reihenfolge (leer wenn keine vorhanden)
+        
+    Hinweis:
+        Berücksichtigt auch eine noch in der Kontodatei eingebettete Historie älterer Datenbestände
+    """
+    account_data = load_json(f"{_ACCOUNTS_DIR_PREFIX}{account_id}.json")
+    transactions = list(account_data.get('transactions') or []) if account_data else []
+    transactions.extend(load_json_lines(_transaction_log_path(account_id)))
+    return transactions
+
 def process_quarterly_fees(current_date):
     """
     Verarbeitet die vierteljährlichen Kontogebühren.
@@ -187,79 +434,91 @@ def process_quarterly_fees(current_date):
     print(f"\n--- Processing Quarterly Fees for {current_date.isoformat()} ---")
     charged_count = 0
     
-    for filename in os.listdir(config.ACCOUNTS_DIR):
-        if not filename.startswith('CH-') or not filename.endswith('.json'):
-            continue
-            
-        account_id = filename[:-5]
-        account_path = os.path.join(config.ACCOUNTS_DIR, filename)
-        account = load_json(account_path) # load_json sollte Decimal zurückgeben
+    # Alle Kontoänderungen gesammelt schreiben statt einzeln pro Konto
+    # Konstanten einmal vor der Schleife binden statt pro Konto nachzuschlagen
+    fee_amount = config.QUARTERLY_FEE
+    zero = _ZERO_DEC
+    accounts_dir_prefix = _ACCOUNTS_DIR_PREFIX
+    current_date_iso = current_date.isoformat()
+    # Felder, die für alle Konten dieses Laufs gleich sind, nur einmal setzen
+    fee_tx_template = dict(_FEE_TX_TEMPLATE, amount=fee_amount, timestamp=current_date_iso)
+    # Fälligkeitsdatum pro Datumsstring nur einmal berechnen: nach einer Gebührenrunde teilen
+    # praktisch alle Konten dasselbe last_fee_date, die Datumsarithmetik läuft damit pro Gruppe statt pro Konto
+    fee_due_dates = {}
+
+    _load_account_sets()
+    account_ids = sorted(_regular_accounts)
+    account_paths = [f"{accounts_dir_prefix}{account_id}.json" for account_id in account_ids]
+    # Transaktions-IDs für den ganzen Lauf als Block vorab erzeugen (eine UUID statt einer pro Konto)
+    fee_tx_ids = iter(reserve_ids("QF", len(account_ids)))
+    with batched_writes():
+        # Die Kontodateien werden im Thread-Pool vorausgelesen (reines Datei-I/O, siehe iter_file_contents);
+        # Parsen, Prüfen und Buchen bleiben im aufrufenden Thread, in derselben Reihenfolge wie bisher
+        account_contents = iter_file_contents(account_paths, drop_cache=True)
+        for account_id, account_path, content in zip(account_ids, account_paths, account_contents):
+            account = _load_account_fast(account_path, content=content) # Beträge bereits als Decimal
         
-        if not account or account.get('status') != 'active':
-            continue
+            if not account or account.get('status') != 'active':
+                continue
+
+            last_fee_date_str = account.get('last_fee_date')
+            if not last_fee_date_str:
+                # Fallback oder Fehlerbehandlung: Setze auf created_at oder aktuelles Datum - 3 Monate
+                # Für neue Konten ist last_fee_date = created_at, Gebühr erst nach 3 Monaten fällig
+                date_str = account.get('created_at')
+            else:
+                date_str = last_fee_date_str
 
-        last_fee_date_str = account.get('last_fee_date')
-        if not last_fee_date_str:
-            # Fallback oder Fehlerbehandlung: Setze auf created_at oder aktuelles Datum - 3 Monate
-            # Für neue Konten ist last_fee_date = created_at, Gebühr erst nach 3 Monaten fällig
-            last_fee_date = parse_datetime(account.get('created_at'))
-            if not last_fee_date:
-                 print(f"Warning: Could not determine last_fee_date or created_at for {account_id}. Skipping fee.")
-                 continue
-        else:
-            last_fee_date = parse_datetime(last_fee_date_str)
-
-        if not last_fee_date:
-            print(f"Warning: Could not parse last_fee_date for {account_id}. Skipping fee.")
-            continue
-            
-        # Nächstes Fälligkeitsdatum für die Gebühr (letzte Gebühr + 3 Monate)
-        # Wichtig: relativedelta muss importiert sein: from dateutil.relativedelta import relativedelta
-        next_fee_due_date = last_fee_date + relativedelta(months=3)
-
-        # Ist das current_date am oder nach dem Fälligkeitsdatum?
-        # Die Überprüfung des spezifischen Quartalsmonats (z.B. 3,6,9,12) geschieht durch den Aufrufer (time_processing_service)
-        # Hier prüfen wir primär, ob die Zeitspanne von 3 Monaten seit der letzten Gebühr erreicht ist.
-        if current_date >= next_fee_due_date:
-            fee_amount = config.QUARTERLY_FEE
-            balance = account.get('balance', Decimal('0.00')) # Sicherstellen, dass es Decimal ist
-            if not isinstance(balance, Decimal): # Zusätzliche Absicherung
-                balance = Decimal(str(balance))
-
-            transaction_status = "completed"
-            reason = ""
-            new_balance = balance # Standardmäßig ändert sich der Saldo nicht (falls Gebühr fehlschlägt)
-
-            if balance >= fee_amount:
-                new_balance = balance - fee_amount
-                account['balance'] = new_balance
-                account['last_fee_date'] = current_date.isoformat() # Wichtig: Datum aktualisieren!
-                print(f"Quarterly fee of {fee_amount} charged to {account_id}. New balance: {account['balance']}")
-                charged_count += 1
+            if date_str in fee_due_dates:
+                next_fee_due_date = fee_due_dates[date_str]
             else:
-                transaction_status = "rejected" 
-                reason = "Insufficient funds for quarterly fee"
-                print(f"Warning: Insufficient funds for quarterly fee on {account_id}. Fee not charged.")
+                last_fee_date = parse_datetime(date_str)
+                # Nächstes Fälligkeitsdatum für die Gebühr (letzte Gebühr + 3 Monate)
+                next_fee_due_date = last_fee_date + relativedelta(months=3) if last_fee_date else None
+                fee_due_dates[date_str] = next_fee_due_date
+
+            if not next_fee_due_date:
+                if not last_fee_date_str:
+                    print(f"Warning: Could not determine last_fee_date or created_at for {account_id}. Skipping fee.")
+                else:
+                    print(f"Warning: Could not parse last_fee_date for {account_id}. Skipping fee.")
+                continue
+
+            # Ist das current_date am oder nach dem Fälligkeitsdatum?
+            # Die Überprüfung des spezifischen Quartalsmonats (z.B. 3,6,9,12) geschieht durch den Aufrufer (time_processing_service)
+            # Hier prüfen wir primär, ob die Zeitspanne von 3 Monaten seit der letzten Gebühr erreicht ist.
+            if current_date >= next_fee_due_date:
+                balance = account.get('balance', zero)
+
+                transaction_status = "completed"
+                reason = ""
+                new_balance = balance # Standardmäßig ändert sich der Saldo nicht (falls Gebühr fehlschlägt)
+
+                # Vergleich und Abzug exakt in Decimal: to_cents rundet kaufmännisch und würde z.B. einen
+                # Saldo von 24.995 als 25.00 gelten lassen (die C-Implementierung von decimal ist hier
+                # ohnehin schneller als die Umrechnung in Rappen und zurück)
+                if balance >= fee_amount:
+                    new_balance = balance - fee_amount
+                    account['balance'] = new_balance
+                    account['last_fee_date'] = current_date_iso # Wichtig: Datum aktualisieren!
+                    print(f"Quarterly fee of {fee_amount} charged to {account_id}. New balance: {new_balance}")
+                    charged_count += 1
+                else:
+                    transaction_status = "rejected" 
+                    reason = "Insufficient funds for quarterly fee"
+                    print(f"Warning: Insufficient funds for quarterly fee on {account_id}. Fee not charged.")
             
-            # Gebührentransaktion erstellen und speichern
-            fee_tx = {
-                "transaction_id": generate_id("QF"),
-                "type": "quarterly_fee",
-                "account": account_id,
-                "amount": fee_amount,
-                "timestamp": current_date.isoformat(),
-                "status": transaction_status,
-                "balance_before": balance,
-                "balance_after": new_balance, 
-                "reason": reason
-            }
-            # add_transaction_to_account speichert das account-Objekt danach
-            if not add_transaction_to_account(account, fee_tx):
-                 print(f"Error: Could not add quarterly fee transaction to account {account_id}")
-            # Das account Objekt wurde durch add_transaction_to_account bereits gespeichert (da es save_account aufruft)
-            # Es ist nicht nötig, save_json(account_path, account) hier erneut aufzurufen,
-            # es sei denn, add_transaction_to_account gibt das modifizierte Konto zurück und speichert nicht selbst.
-            # Annahme: add_transaction_to_account(account_obj, tx) modifiziert account_obj und ruft save_account(account_obj) auf.
+                # Gebührentransaktion aus der Vorlage erstellen und speichern
+                fee_tx = fee_tx_template.copy()
+                fee_tx["transaction_id"] = next(fee_tx_ids)
+                fee_tx["account"] = account_id
+                fee_tx["status"] = transaction_status
+                fee_tx["balance_before"] = balance
+                fee_tx["balance_after"] = new_balance
+                fee_tx["reason"] = reason
+                # add_transaction_to_account speichert das account-Objekt danach (kein weiterer save nötig)
+                if not add_transaction_to_account(account, fee_tx):
+                     print(f"Error: Could not add quarterly fee transaction to account {account_id}")
     
     if charged_count == 0:
         print("No accounts due for quarterly fees this period based on their last_fee_date.")
@@ -291,7 +550,7 @@ def close_account(account_id):
         return True
 
     # Check if account has zero balance
-    if account_data['balance'] != Decimal('0.00'):
+    if account_data['balance'] != _ZERO_DEC:
         print(f"Error: Cannot close account {account_id} with non-zero balance: {account_data['balance']}")
         return False
 
@@ -302,12 +561,15 @@ def close_account(account_id):
         print(f"Error: Cannot close account {account_id} with active credit account.")
         return False
 
+    # Ein Zeitstempel für den gesamten Schliessvorgang
+    now_iso = datetime.now().isoformat()
+
     # Create closing transaction
     close_tx = {
         "transaction_id": generate_id("CLS"),
         "type": "account_closure",
         "account": account_id,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso,
         "status": "completed",
         "balance_before": account_data['balance'],
         "balance_after": account_data['balance']
@@ -315,30 +577,29 @@ def close_account(account_id):
 
     # Update account status
     account_data['status'] = 'closed'
-    account_data['closed_at'] = datetime.now().isoformat()
+    account_data['closed_at'] = now_iso
 
     # If there's a credit account, close it too if it's not already closed
     if credit_account and credit_account['status'] not in ['closed', 'written_off']:
         credit_account['status'] = 'closed'
-        credit_account['closed_at'] = datetime.now().isoformat()
+        credit_account['closed_at'] = now_iso
         
         # Create credit account closure transaction
         credit_close_tx = {
             "transaction_id": generate_id("CLS"),
             "type": "credit_account_closure",
             "account": credit_account_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "status": "completed",
             "balance_before": credit_account['balance'],
             "balance_after": credit_account['balance']
         }
         
-        # Add credit closure transaction
+        # Add credit closure transaction (speichert das Kreditkonto mit)
         add_transaction_to_account(credit_account, credit_close_tx)
-        save_account(credit_account)
         print(f"Associated credit account {credit_account_id} closed.")
 
-    # Add transaction and save
+    # Add transaction (speichert das Konto mit)
     add_transaction_to_account(account_data, close_tx)
     print(f"Account {account_id} closed successfully.")
     return True
@@ -4,7 +4,7 @@
 # Zentrale Stelle für alle Systemparameter und Verzeichnispfade
 
 import os
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 
 # --- Projektstruktur und Verzeichnispfade ---
 # Bestimmt den absoluten Pfad zum Projektstammverzeichnis
@@ -22,20 +22,22 @@ ACCOUNTS_DIR = os.path.join(DATA_DIR, "accounts")  # Kontodaten (JSON-Dateien pr
 LEDGER_FILE = os.path.join(DATA_DIR, "bank_ledger", "ledger.json")  # Bank-Ledger (doppelte Buchführung)
 SYSTEM_DATE_FILE = os.path.join(DATA_DIR, "system_date.json")  # Systemdatum für Zeit-Simulation
 TRANSACTIONS_DIR = os.path.join(DATA_DIR, "transactions")  # Transaktionsdaten (JSON-Dateien pro Transaktion)
+CREDIT_INDEX_FILE = os.path.join(ACCOUNTS_DIR, "credit_index.idx")  # Index der laufenden Kredite (JSON, bewusst ohne .json-Endung)
 
 # --- Finanzkonstanten ---
 # Grundlegende Finanzparameter für das Banksystem
 # Alle Beträge werden als Decimal-Objekte gespeichert für präzise Berechnungen
 CHF_QUANTIZE = Decimal("0.01")  # Rundungsgenauigkeit für CHF-Beträge (2 Dezimalstellen)
 ANNUAL_FEE = Decimal("100.00")  # Jährliche Kontoführungsgebühr pro Konto
-QUARTERLY_FEE = (ANNUAL_FEE / 4).quantize(CHF_QUANTIZE, ROUND_HALF_UP)  # Vierteljährliche Gebühr (25% der Jahresgebühr)
+QUARTERLY_FEE = Decimal("25.00")  # Vierteljährliche Gebühr (= ANNUAL_FEE / 4, auf CHF_QUANTIZE gerundet)
 CREDIT_FEE = Decimal("250.00")  # Einmalige Gebühr für Kreditvergabe (Bearbeitungsgebühr)
 MIN_CREDIT = Decimal("1000.00")  # Minimaler Kreditbetrag (untere Kreditgrenze)
 MAX_CREDIT = Decimal("15000.00")  # Maximaler Kreditbetrag (obere Kreditgrenze)
 CREDIT_INTEREST_RATE_PA = Decimal("0.15")  # Jährlicher Kreditzinssatz (15% p.a.)
-CREDIT_MONTHLY_RATE = CREDIT_INTEREST_RATE_PA / 12  # Monatlicher Kreditzinssatz (1.25% pro Monat)
+CREDIT_MONTHLY_RATE = Decimal("0.0125")  # Monatlicher Kreditzinssatz (= CREDIT_INTEREST_RATE_PA / 12, 1.25% pro Monat)
 PENALTY_INTEREST_RATE_PA = Decimal("0.30")  # Jährlicher Strafzinssatz (30% p.a. bei Verzug)
-PENALTY_DAILY_RATE = PENALTY_INTEREST_RATE_PA / 365  # Täglicher Strafzinssatz (ca. 0.082% pro Tag)
+# Täglicher Strafzinssatz (= PENALTY_INTEREST_RATE_PA / 365 mit 28 Stellen Decimal-Genauigkeit, ca. 0.082% pro Tag)
+PENALTY_DAILY_RATE = Decimal("0.0008219178082191780821917808219")
 CREDIT_TERM_MONTHS = 12  # Standard-Kreditlaufzeit in Monaten (1 Jahr)
 WRITE_OFF_MONTHS = 6  # Zeitraum bis zur Abschreibung eines Kredits (6 Monate Verzug)
 MAX_MISSED_PAYMENTS = 3 # Anzahl verpasster Zahlungen, bevor Kredit abgeschrieben wird (kann zu write_off führen)
@@ -0,0 +1,152 @@
+# src/credit_index.py
+# Index der laufenden Kredite für das Smart-Phone Haifisch Bank System
+# Führt die IDs aller Kreditkonten mit Status 'active' oder 'blocked' in einer einzigen Indexdatei,
+# damit die täglichen und monatlichen Kreditläufe nicht alle Kreditkonten-Dateien öffnen müssen
+#
+# Regel: Jede Statusänderung eines Kreditkontos muss über account_service.save_account gespeichert
+# werden, nur dort wird der Index nachgeführt. Kredite, die im Index fehlen, übergehen die Läufe
+# stillschweigend; validate_bank_system gleicht den Index deshalb mit den Kontodateien ab (sync)
+
+import os
+from . import config
+from .utils import load_json, save_json
+
+# Status, die ein Kreditkonto für die periodischen Läufe relevant machen
+ACTIVE_STATUSES = frozenset(('active', 'blocked'))
+
+# Im Speicher gehaltener Index (credit_account_id -> Status), wird beim ersten Zugriff geladen
+_index = None
+
+
+def _load():
+    """
+    Liefert den Index und lädt ihn beim ersten Aufruf.
+
+    Returns:
+        dict: Zuordnung credit_account_id -> Status
+
+    Hinweis:
+        - Liest die Indexdatei config.CREDIT_INDEX_FILE
+        - Fehlt die Datei (z.B. bestehender Datenbestand), wird der Index einmalig
+          aus den Kreditkonten-Dateien aufgebaut und gespeichert
+    """
+    global _index
+    if _index is None:
+        data = load_json(config.CREDIT_INDEX_FILE)
+        if data is None:
+            data = _rebuild()
+        _index = data
+    return _index
+
+def _rebuild():
+    """
+    Baut den Index aus den Kreditkonten-Dateien in ACCOUNTS_DIR neu auf.
+
+    Returns:
+        dict: Zuordnung credit_account_id -> Status der laufenden Kredite
+    """
+    index = {}
+    if os.path.isdir(config.ACCOUNTS_DIR):
+        with os.scandir(config.ACCOUNTS_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith('CRCH-') and name.endswith('.json')):
+                    continue
+                credit_account = load_json(entry.path)
+                if credit_account and credit_account.get('status') in ACTIVE_STATUSES:
+                    index[name[:-5]] = credit_account['status']
+    save_json(config.CREDIT_INDEX_FILE, index, compact=True)
+    return index
+
+def rebuild():
+    """
+    Baut den Index aus den Kreditkonten-Dateien neu auf und ersetzt den geladenen Stand.
+    
+    Returns:
+        dict: Neu aufgebauter Index
+        
+    Hinweis:
+        Für Datenbestände, die ausserhalb von save_account verändert wurden
+    """
+    global _index
+    _index = _rebuild()
+    return _index
+
+def sync(actual_index):
+    """
+    Gleicht den Index mit dem tatsächlichen Stand der Kreditkonten ab und korrigiert ihn.
+    
+    Args:
+        actual_index (dict): credit_account_id -> Status aller aktiven und gesperrten
+                             Kreditkonten, wie er in den Kontodateien steht
+        
+    Returns:
+        int: Anzahl abweichender Einträge (0 = Index war korrekt)
+        
+    Hinweis:
+        Bei Abweichungen wird der Index durch actual_index ersetzt und gespeichert
+    """
+    global _index
+    index = _load()
+    mismatches = sum(1 for credit_account_id in index.keys() | actual_index.keys()
+                     if index.get(credit_account_id) != actual_index.get(credit_account_id))
+    if mismatches:
+        _index = dict(actual_index)
+        save_json(config.CREDIT_INDEX_FILE, _index, compact=True)
+    return mismatches
+
+def add(credit_account_id, status):
+    """
+    Trägt den Status eines Kreditkontos in den Index ein.
+
+    Args:
+        credit_account_id (str): ID des Kreditkontos
+        status (str): Aktueller Status des Kreditkontos
+
+    Hinweis:
+        - Nur 'active' und 'blocked' werden geführt, jeder andere Status entfernt das Konto
+        - Die Indexdatei wird nur geschrieben, wenn sich tatsächlich etwas ändert
+    """
+    if status not in ACTIVE_STATUSES:
+        remove(credit_account_id)
+        return
+    index = _load()
+    if index.get(credit_account_id) != status:
+        index[credit_account_id] = status
+        save_json(config.CREDIT_INDEX_FILE, index, compact=True)
+
+def remove(credit_account_id):
+    """
+    Entfernt ein Kreditkonto aus dem Index.
+
+    Args:
+        credit_account_id (str): ID des Kreditkontos
+    """
+    index = _load()
+    if index.pop(credit_account_id, None) is not None:
+        save_json(config.CREDIT_INDEX_FILE, index, compact=True)
+
+def iter_active():
+    """
+    Liefert die IDs aller Kreditkonten mit Status 'active' oder 'blocked'.
+
+    Returns:
+        list: Sortierte Kreditkonto-IDs
+
+    Hinweis:
+        Gibt eine Kopie zurück, die Läufe dürfen den Index währenddessen ändern
+    """
+    return sorted(_load())
+
+def iter_with_status(status):
+    """
+    Liefert die IDs aller Kreditkonten mit einem bestimmten Status.
+    
+    Args:
+        status (str): Gesuchter Status ('active' oder 'blocked')
+        
+    Returns:
+        list: Sortierte Kreditkonto-IDs
+    """
+    return sorted(credit_account_id for credit_account_id, indexed_status in _load().items()
+                  if indexed_status == status)
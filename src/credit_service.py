@@ -4,76 +4,193 @@
 
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+import logging
 from dateutil.relativedelta import relativedelta  # Externes Paket für Datumsberechnungen
-import os
 import json
-from . import config
-from .utils import generate_id, save_json, load_json, parse_datetime
+from . import config, credit_index
+from .utils import generate_id, reserve_ids, save_json, load_json, parse_datetime, to_cents, from_cents, batched_writes
 from .ledger_service import update_bank_ledger
+# account_service importiert credit_service nicht, daher ist der Import auf Modulebene zyklenfrei
+from .account_service import get_account, get_accounts, add_transaction_to_account, save_account
 
-def calculate_amortization(principal, annual_rate, term_months):
+# Logger für Diagnoseausgaben (Debug-Level standardmässig unterdrückt)
+log = logging.getLogger(__name__)
+
+# Täglicher Strafzinssatz, einmalig statt pro Konto und Lauf berechnet (= PENALTY_INTEREST_RATE_PA / 365)
+_DAILY_PENALTY_RATE = config.PENALTY_DAILY_RATE
+
+# Monatlicher Kreditzinssatz als exakter Bruch (0.0125 = 1/80) für die Rappen-Arithmetik
+_MONTHLY_RATE_NUM, _MONTHLY_RATE_DEN = config.CREDIT_MONTHLY_RATE.as_integer_ratio()
+
+# Vorab erzeugte Null für Vorgabewerte und Vergleiche (Decimal ist unveränderlich, daher gefahrlos teilbar)
+_ZERO_DEC = Decimal('0.00')
+
+def _compute_repayment_cents(balance_cents, rate_num, rate_den, monthly_cents):
     """
-    Berechnet den Tilgungsplan für einen Kredit.
+    Teilt eine Monatsrate in Zins und Tilgung auf, ganz in Rappen.
+    
+    Args:
+        balance_cents (int): Kreditsaldo vor der Zahlung in Rappen
+        rate_num (int): Zähler des monatlichen Zinssatzes
+        rate_den (int): Nenner des monatlichen Zinssatzes
+        monthly_cents (int): Monatsrate in Rappen
+        
+    Returns:
+        tuple: (interest_cents, principal_cents), Tilgung kann negativ sein
+        
+    Hinweis:
+        Rundet den Zins kaufmännisch (ROUND_HALF_UP, auch für negative Werte) und liefert damit
+        dieselben Rappenbeträge wie (saldo * zinssatz).quantize(CHF_QUANTIZE, ROUND_HALF_UP)
+    """
+    product = balance_cents * rate_num
+    interest_cents = (abs(product) * 2 + rate_den) // (2 * rate_den)
+    if product < 0:
+        interest_cents = -interest_cents
+    return interest_cents, monthly_cents - interest_cents
+
+def _amortization_kernel(principal, monthly_rate, monthly_payment, term_months):
+    """
+    Rechenkern des Tilgungsplans: reine Zahlen-Rekursion ohne Aufbau von Dictionaries.
     
     Args:
         principal (Decimal): Kreditsumme
-        annual_rate (Decimal): Jährlicher Zinssatz
+        monthly_rate (Decimal): Monatlicher Zinssatz
+        monthly_payment (Decimal): Auf Rappen gerundete Monatsrate
         term_months (int): Kreditlaufzeit in Monaten
         
     Returns:
-        tuple: (monthly_payment, schedule)
-            - monthly_payment: Monatliche Rate
-            - schedule: Liste der Tilgungsplan-Einträge
+        tuple: (monthly_payment, rows)
+            - monthly_payment: Rate der letzten Zeile (ggf. angepasst)
+            - rows: Liste von Tupeln (Monat, Rate, Tilgung, Zins, Restschuld)
             
     Hinweis:
-        Verwendet die Formel: P = (r*PV) / (1 - (1+r)^-n)
-        wobei P = Zahlung, r = monatlicher Zinssatz, PV = Kreditsumme, n = Anzahl Zahlungen
+        - Bewusst als Decimal-Rekursion: Zinsen werden jeden Monat kaufmännisch auf Rappen gerundet,
+          eine geschlossene Formel in float würde davon abweichende Rappenbeträge liefern
+        - Eine Umstellung auf ganze Rappen (int) wurde gemessen und ist hier langsamer, da die
+          Zeilen ohnehin als Decimal zurückgegeben werden (C-Implementierung von decimal)
     """
-    monthly_rate = annual_rate / 12
-
-    # Monatliche Rate berechnen
-    if monthly_rate == 0:
-        # Spezialfall: Keine Zinsen
-        monthly_payment = principal / term_months
-    else:
-        monthly_payment = (monthly_rate * principal) / (1 - (1 + monthly_rate) ** -term_months)
-
-    # Auf 2 Dezimalstellen runden
-    monthly_payment = monthly_payment.quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
-
-    # Tilgungsplan generieren
-    schedule = []
+    rows = []
     remaining_principal = principal
-
-    for month in range(1, term_months + 1):
+    chf_quantize = config.CHF_QUANTIZE
+    # Liegt die Kreditsumme mit genau 2 Dezimalstellen vor (Normalfall), ist jede Restschuld-Differenz
+    # bereits exakt auf Rappen und das quantize pro Monat entfällt; nur sonst wird die Restschuld gerundet
+    round_remaining = principal.as_tuple().exponent != -2
+
+    # Alle Monate ausser dem letzten; der letzte Monat tilgt immer die ganze Restschuld und wird
+    # nach der Schleife angehängt, damit die Schleife nicht jeden Monat auf ihn prüfen muss
+    for month in range(1, term_months):
         if remaining_principal <= 0:
             break
 
         # Zinsen für diesen Zeitraum berechnen
-        interest_payment = (remaining_principal * monthly_rate).quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
+        interest_payment = (remaining_principal * monthly_rate).quantize(chf_quantize, ROUND_HALF_UP)
 
         # Tilgung für diesen Zeitraum berechnen (Rate - Zinsen)
-        principal_payment = (monthly_payment - interest_payment).quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
+        # Beide Werte sind bereits auf Rappen gerundet, die Differenz ist exakt (kein quantize nötig)
+        principal_payment = monthly_payment - interest_payment
 
-        # Letzte Rate anpassen um Rundungsprobleme zu vermeiden
-        if month == term_months or principal_payment > remaining_principal:
+        # Rate übersteigt die Restschuld (vorzeitig letzte Rate): nur noch die Restschuld tilgen
+        if principal_payment > remaining_principal:
             principal_payment = remaining_principal
             monthly_payment = principal_payment + interest_payment
 
         # Restkreditsumme aktualisieren
-        remaining_principal = (remaining_principal - principal_payment).quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
+        remaining_principal = remaining_principal - principal_payment
+        if round_remaining:
+            remaining_principal = remaining_principal.quantize(chf_quantize, ROUND_HALF_UP)
+
+        rows.append((month, monthly_payment, principal_payment, interest_payment, remaining_principal))
+
+    # Letzte Rate: Restschuld vollständig tilgen, um Rundungsdifferenzen auszugleichen
+    if term_months > 0 and remaining_principal > 0:
+        interest_payment = (remaining_principal * monthly_rate).quantize(chf_quantize, ROUND_HALF_UP)
+        principal_payment = remaining_principal
+        monthly_payment = principal_payment + interest_payment
+        remaining_principal = remaining_principal - principal_payment
+        if round_remaining:
+            remaining_principal = remaining_principal.quantize(chf_quantize, ROUND_HALF_UP)
+        rows.append((term_months, monthly_payment, principal_payment, interest_payment, remaining_principal))
+
+    return monthly_payment, rows
+
+@lru_cache(maxsize=64)
+def _annuity_denominator(monthly_rate, term_months):
+    """
+    Nenner der Annuitätenformel, 1 - (1+r)^-n, zwischengespeichert pro (Zinssatz, Laufzeit).
+    
+    Hinweis:
+        Die Decimal-Potenz ist der teuerste Schritt von calculate_amortization; praktisch alle
+        Kredite verwenden denselben Zinssatz und dieselbe Laufzeit
+    """
+    return 1 - (1 + monthly_rate) ** -term_months
 
-        # Zum Plan hinzufügen
-        schedule.append({
+def calculate_amortization(principal, annual_rate, term_months):
+    """
+    Berechnet den Tilgungsplan für einen Kredit.
+    
+    Args:
+        principal (Decimal): Kreditsumme
+        annual_rate (Decimal): Jährlicher Zinssatz
+        term_months (int): Kreditlaufzeit in Monaten
+        
+    Returns:
+        tuple: (monthly_payment, schedule)
+            - monthly_payment: Monatliche Rate
+            - schedule: Liste der Tilgungsplan-Einträge
+            
+    Hinweis:
+        - Verwendet die Formel: P = (r*PV) / (1 - (1+r)^-n)
+          wobei P = Zahlung, r = monatlicher Zinssatz, PV = Kreditsumme, n = Anzahl Zahlungen
+        - Die Berechnung ist pro (Kreditsumme, Zinssatz, Laufzeit) zwischengespeichert
+          (siehe _amortization_rows), der Aufrufer erhält trotzdem immer eigene Dictionaries
+    """
+    # Schlüssel über as_tuple(): Decimal('1000') und Decimal('1000.00') sind gleich, liefern aber
+    # unterschiedlich gerundete Restschulden und dürfen sich keinen Cache-Eintrag teilen
+    monthly_payment, rows = _amortization_rows(principal.as_tuple(), annual_rate.as_tuple(), term_months)
+    schedule = [
+        {
             "month": month,
-            "payment": monthly_payment,
+            "payment": payment,
             "principal": principal_payment,
             "interest": interest_payment,
             "remaining": remaining_principal
-        })
+        }
+        for month, payment, principal_payment, interest_payment, remaining_principal in rows
+    ]
 
     return monthly_payment, schedule
 
+@lru_cache(maxsize=1024)
+def _amortization_rows(principal_key, annual_rate_key, term_months):
+    """
+    Berechnet Rate und Tilgungsplan-Zeilen, zwischengespeichert pro (Kreditsumme, Zinssatz, Laufzeit).
+    
+    Args:
+        principal_key (DecimalTuple): Kreditsumme als Decimal.as_tuple()
+        annual_rate_key (DecimalTuple): Jährlicher Zinssatz als Decimal.as_tuple()
+        term_months (int): Kreditlaufzeit in Monaten
+        
+    Returns:
+        tuple: (monthly_payment, rows) wie _amortization_kernel, rows als Tupel (unveränderlich)
+    """
+    principal = Decimal(principal_key)
+    monthly_rate = Decimal(annual_rate_key) / 12
+
+    # Monatliche Rate berechnen
+    if monthly_rate == 0:
+        # Spezialfall: Keine Zinsen
+        monthly_payment = principal / term_months
+    else:
+        monthly_payment = (monthly_rate * principal) / _annuity_denominator(monthly_rate, term_months)
+
+    # Auf 2 Dezimalstellen runden
+    monthly_payment = monthly_payment.quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
+
+    # Tilgungsplan über den Rechenkern erzeugen; Dictionaries baut erst calculate_amortization auf
+    monthly_payment, rows = _amortization_kernel(principal, monthly_rate, monthly_payment, term_months)
+    return monthly_payment, tuple(rows)
+
 def request_credit(transaction_data):
     """
     Verarbeitet einen Kreditantrag, zahlt den Kredit aus und erhebt die Gebühr.
@@ -93,8 +210,7 @@ def request_credit(transaction_data):
         - Aktualisiert Ledger
         - Erhebt Kreditgebühr
     """
-    # Import hier um zirkuläre Imports zu vermeiden
-    from .account_service import get_account, add_transaction_to_account, save_account
+    # Import hier um zirkuläre Imports zu vermeiden (time_processing_service importiert credit_service)
     from .time_processing_service import get_system_date
     
     main_account_id = transaction_data.get('main_account')
@@ -152,12 +268,12 @@ def request_credit(transaction_data):
     credit_account['credit_end_date'] = (system_date_for_credit_start + relativedelta(months=config.CREDIT_TERM_MONTHS)).isoformat()
     credit_account['remaining_payments'] = config.CREDIT_TERM_MONTHS
     credit_account['missed_payments_count'] = 0
-    credit_account['penalty_accrued'] = Decimal('0.00')  # Strafen bei neuem Kredit zurücksetzen
+    credit_account['penalty_accrued'] = _ZERO_DEC  # Strafen bei neuem Kredit zurücksetzen
 
-    # Tilgungsplan berechnen
-    monthly_payment, schedule = calculate_amortization(requested_amount, config.CREDIT_INTEREST_RATE_PA, config.CREDIT_TERM_MONTHS)
+    # Monatliche Rate berechnen; der Tilgungsplan wird nicht gespeichert, er ist durch
+    # original_amount, Zinssatz und Laufzeit bestimmt und mit calculate_amortization reproduzierbar
+    monthly_payment, _ = calculate_amortization(requested_amount, config.CREDIT_INTEREST_RATE_PA, config.CREDIT_TERM_MONTHS)
     credit_account['monthly_payment'] = monthly_payment
-    credit_account['amortization_schedule'] = schedule  # Plan speichern
 
     print(f"Credit Approved: {requested_amount} for {main_account_id}. Monthly Payment: {monthly_payment}")
 
@@ -201,14 +317,9 @@ def request_credit(transaction_data):
             ('income', +config.CREDIT_FEE)  # Bank erzielt Einnahmen
         ])
 
-    # --- Alle Änderungen speichern ---
-    # Hauptkonto speichern
-    save_account(main_account)
-
-    # Kreditkonto speichern
-    save_account(credit_account)
-
-    # Transaktionen zu den jeweiligen Konten hinzufügen
+    # --- Transaktionen hinzufügen und Änderungen speichern ---
+    # add_transaction_to_account speichert das Konto selbst; ein separates save_account vorher
+    # hätte beide Konten nur ein weiteres Mal geschrieben
     add_transaction_to_account(main_account, disburse_tx)  # Auszahlung zum Hauptkonto
     add_transaction_to_account(main_account, fee_tx)  # Gebühr zum Hauptkonto
     add_transaction_to_account(credit_account, disburse_tx)  # Auszahlung auch zum Kreditkonto verknüpfen
@@ -233,8 +344,6 @@ def process_manual_credit_repayment(transaction_data):
         - Vereinfacht: Reduziert direkt den Kapitalbetrag
         - Berechnet den Tilgungsplan nicht neu
     """
-    # Import hier um zirkuläre Imports zu vermeiden
-    from .account_service import get_account, add_transaction_to_account, save_account
     main_account_id = transaction_data.get('main_account')
     credit_account_id = transaction_data.get('credit_account')  # Sollte CR<main_account_id> sein
     amount_str = transaction_data.get('amount', '0')
@@ -252,8 +361,8 @@ def process_manual_credit_repayment(transaction_data):
         "credit_account": credit_account_id,
         "main_account": main_account_id,
         "amount": repayment_amount,
-        "principal_amount": Decimal('0.00'),  # Will be determined
-        "interest_amount": Decimal('0.00'),  # Manual repayment goes to principal first
+        "principal_amount": _ZERO_DEC,  # Will be determined
+        "interest_amount": _ZERO_DEC,  # Manual repayment goes to principal first
         "timestamp": timestamp,
         "status": "rejected",
         "credit_balance_before": None,
@@ -317,7 +426,7 @@ def process_manual_credit_repayment(transaction_data):
 
     # --- Update Credit Account Status if Paid Off ---
     if credit_account['balance'] <= 0:
-        credit_account['balance'] = Decimal('0.00')  # Ensure exactly zero
+        credit_account['balance'] = _ZERO_DEC  # Ensure exactly zero
         credit_account['status'] = 'paid_off'
         credit_account['remaining_payments'] = 0
         # Clear schedule? Optional, keep for history? Keep for now.
@@ -331,11 +440,9 @@ def process_manual_credit_repayment(transaction_data):
     ])
 
     # --- Save ---
+    # add_transaction_to_account saves each account itself, no extra save_account needed
     add_transaction_to_account(main_account, tx_record)
     add_transaction_to_account(credit_account, tx_record)
-    # Explicit saves just in case
-    save_account(main_account)
-    save_account(credit_account)
 
     return tx_record
 
@@ -347,183 +454,203 @@ def process_monthly_credit_payments(current_date):
     Transaktionen erstellt und Ledger-Einträge vorgenommen werden.
     Handhabt auch nicht ausreichende Deckung und Kontosperrungen.
     """
-    # Lokale Imports, um Abhängigkeiten klar zu halten und zirkuläre Imports zu vermeiden
-    from .account_service import get_account, add_transaction_to_account, save_account
-    # generate_id, update_bank_ledger und config sind bereits auf Modulebene verfügbar
+    # Häufig benutzte Konstanten als lokale Namen (spart Attribut-Lookups pro Konto)
+    rate_num = _MONTHLY_RATE_NUM
+    rate_den = _MONTHLY_RATE_DEN
+    # Zeitstempel des Laufs einmal formatieren statt pro Kredit (Transaktion und Zahlungsversuch)
+    current_date_iso = current_date.isoformat()
 
     print(f"\n--- Processing Monthly Credit Payments for {current_date.isoformat()} ---")
     processed_successful_count = 0
     payment_attempted_count = 0
+    # Ledger-Änderungen aller erfolgreichen Zahlungen in Rappen summieren und am Ende einmal buchen
+    ledger_payments_cents = 0
+    ledger_principal_cents = 0
+    ledger_interest_cents = 0
+
+    # Nur laufende Kredite aus dem Kreditindex statt aller Dateien im Kontoverzeichnis.
+    # Kredit- und zugehörige Hauptkonten werden zusammen vorgeladen (Dateien parallel gelesen, jedes
+    # Konto wird pro Lauf genau einmal gelesen) und anschliessend der Reihe nach verarbeitet
+    credit_account_ids = credit_index.iter_active()
+    main_account_ids = [credit_account_id[2:] for credit_account_id in credit_account_ids]
+    loaded_accounts = dict(get_accounts(credit_account_ids + main_account_ids))
+    # Transaktions-IDs der Raten als Block vorab erzeugen (eine UUID statt einer pro Kredit)
+    repayment_tx_ids = iter(reserve_ids("RP", len(credit_account_ids)))
+
+    # Konten, Transaktionslogs, Index und Hauptbuch gesammelt am Ende des Laufs schreiben
+    with batched_writes():
+        # batched_writes schreibt die vorgemerkten Konten auch bei einer Ausnahme; das Hauptbuch
+        # deshalb im finally buchen, damit es immer zu den gespeicherten Konten passt
+        try:
+            for credit_account_id in credit_account_ids:
+                credit_account = loaded_accounts[credit_account_id]
 
-    for filename in os.listdir(config.ACCOUNTS_DIR):
-        if not filename.startswith('CRCH-') or not filename.endswith('.json'):
-            continue
+                if not credit_account or credit_account.get('status') not in ['active', 'blocked']:
+                    continue
 
-        credit_account_id = filename[:-5]
-        credit_account = get_account(credit_account_id)
+                # Zähler sind nach get_account bereits int (siehe _account_object_hook)
+                remaining_payments_int = credit_account.get('remaining_payments', 0)
 
-        if not credit_account or credit_account.get('status') not in ['active', 'blocked']:
-            continue
+                # Betragsfelder sind nach get_account bereits Decimal (siehe _account_object_hook),
+                # keine erneute Typprüfung pro Konto nötig
+                current_credit_balance = credit_account.get('balance', Decimal('0.01'))
 
-        # Sicherstellen, dass remaining_payments als int behandelt wird
-        remaining_payments_val = credit_account.get('remaining_payments', 0)
-        try:
-            remaining_payments_int = int(remaining_payments_val)
-        except (ValueError, TypeError):
-            print(f"Warning: Could not convert remaining_payments '{remaining_payments_val}' to int for {credit_account_id}. Defaulting to 0.")
-            remaining_payments_int = 0
-
-        current_credit_balance = credit_account.get('balance', Decimal('0.01'))
-        if not isinstance(current_credit_balance, Decimal):
-             current_credit_balance = Decimal(str(current_credit_balance))
-
-        if remaining_payments_int <= 0 and current_credit_balance <= Decimal('0.00'):
-            # Wenn keine Zahlungen mehr übrig sind und Saldo <=0, dann als paid_off markieren, falls noch nicht geschehen
-            if credit_account.get('status') != 'paid_off':
-                credit_account['status'] = 'paid_off'
-                credit_account['balance'] = Decimal('0.00')
-                save_account(credit_account)
-                print(f"Credit {credit_account_id} already paid off or no remaining payments. Marked as paid_off.")
-            continue
+                if remaining_payments_int <= 0 and current_credit_balance <= _ZERO_DEC:
+                    # Wenn keine Zahlungen mehr übrig sind und Saldo <=0, dann als paid_off markieren, falls noch nicht geschehen
+                    if credit_account.get('status') != 'paid_off':
+                        credit_account['status'] = 'paid_off'
+                        credit_account['balance'] = _ZERO_DEC
+                        save_account(credit_account)
+                        print(f"Credit {credit_account_id} already paid off or no remaining payments. Marked as paid_off.")
+                    continue
         
-        payment_attempted_count += 1
-        main_account_id = credit_account_id[2:] # Hauptkonto-ID ableiten
-        main_account = get_account(main_account_id)
-
-        if not main_account or main_account.get('status') == 'closed':
-            print(f"Error: Main account {main_account_id} for credit {credit_account_id} not found or closed. Skipping payment.")
-            # Hier könnte man eine Warnung im Kreditkonto hinterlegen
-            continue
-
-        scheduled_monthly_payment = credit_account.get('monthly_payment')
-        if not isinstance(scheduled_monthly_payment, Decimal):
-            scheduled_monthly_payment = Decimal(str(scheduled_monthly_payment if scheduled_monthly_payment is not None else '0.00'))
-
-        if scheduled_monthly_payment <= Decimal('0.00'):
-            print(f"Warning: Credit {credit_account_id} has zero or negative monthly payment ({scheduled_monthly_payment}). Skipping.")
-            continue
-
-        repayment_tx_id = generate_id("RP") 
-        tx_status = "rejected" # Standardmäßig abgelehnt
-        tx_reason = ""
+                payment_attempted_count += 1
+                main_account_id = credit_account_id[2:] # Hauptkonto-ID ableiten
+                main_account = loaded_accounts[main_account_id] # Bereits vorgeladen
+
+                if not main_account or main_account.get('status') == 'closed':
+                    print(f"Error: Main account {main_account_id} for credit {credit_account_id} not found or closed. Skipping payment.")
+                    # Hier könnte man eine Warnung im Kreditkonto hinterlegen
+                    continue
+
+                scheduled_monthly_payment = credit_account.get('monthly_payment')
+                if scheduled_monthly_payment is None:
+                    scheduled_monthly_payment = _ZERO_DEC
+
+                if scheduled_monthly_payment <= _ZERO_DEC:
+                    print(f"Warning: Credit {credit_account_id} has zero or negative monthly payment ({scheduled_monthly_payment}). Skipping.")
+                    continue
+
+                repayment_tx_id = next(repayment_tx_ids)
+                tx_status = "rejected" # Standardmäßig abgelehnt
+                tx_reason = ""
         
-        current_main_balance = main_account.get('balance', Decimal('0.00'))
-        credit_balance_before_payment = credit_account.get('balance', Decimal('0.00'))
+                current_main_balance = main_account.get('balance', _ZERO_DEC)
+                credit_balance_before_payment = credit_account.get('balance', _ZERO_DEC)
         
-        actual_payment_amount_for_tx = scheduled_monthly_payment # Wird ggf. bei letzter Zahlung angepasst
-        principal_component = Decimal('0.00')
-        interest_component = Decimal('0.00')
+                actual_payment_amount_for_tx = scheduled_monthly_payment # Wird ggf. bei letzter Zahlung angepasst
+                principal_component = _ZERO_DEC
+                interest_component = _ZERO_DEC
         
-        # Initialisiere Salden für Transaktionshistorie
-        final_main_balance = current_main_balance
-        final_credit_balance = credit_balance_before_payment
-
-        # Wenn das Hauptkonto bereits gesperrt ist ODER wenn das Kreditkonto gesperrt ist
-        # UND die Deckung nicht ausreicht, dann Zahlung fehlschlagen und missed_payment erhöhen.
-        payment_can_be_attempted = True
-        if main_account.get('status') == 'blocked':
-            tx_reason = "Main account is blocked."
-            print(f"Monthly payment attempt for {credit_account_id} (which is {credit_account.get('status')}) cannot be processed: {tx_reason}")
-            payment_can_be_attempted = False # Zahlung kann nicht abgebucht werden
-            # missed_payments_count wird unten erhöht, wenn das Kreditkonto 'active' oder 'blocked' war und eine Zahlung fällig war.
-
-        if payment_can_be_attempted and current_main_balance < scheduled_monthly_payment:
-            tx_reason = "Insufficient funds in main account for scheduled payment."
-            print(f"Monthly payment for {credit_account_id} (status: {credit_account.get('status')}) failed: {tx_reason}")
-            payment_can_be_attempted = False # Markiere als nicht erfolgreich
-            # Sperre Hauptkonto, falls nicht schon gesperrt
-            if main_account.get('status') != 'blocked':
-                main_account['status'] = 'blocked'
-                print(f"Main account {main_account_id} status changed to 'blocked' due to failed credit payment.")
+                # Initialisiere Salden für Transaktionshistorie
+                final_main_balance = current_main_balance
+                final_credit_balance = credit_balance_before_payment
+
+                # Wenn das Hauptkonto bereits gesperrt ist ODER wenn das Kreditkonto gesperrt ist
+                # UND die Deckung nicht ausreicht, dann Zahlung fehlschlagen und missed_payment erhöhen.
+                payment_can_be_attempted = True
+                if main_account.get('status') == 'blocked':
+                    tx_reason = "Main account is blocked."
+                    print(f"Monthly payment attempt for {credit_account_id} (which is {credit_account.get('status')}) cannot be processed: {tx_reason}")
+                    payment_can_be_attempted = False # Zahlung kann nicht abgebucht werden
+                    # missed_payments_count wird unten erhöht, wenn das Kreditkonto 'active' oder 'blocked' war und eine Zahlung fällig war.
+
+                if payment_can_be_attempted and current_main_balance < scheduled_monthly_payment:
+                    tx_reason = "Insufficient funds in main account for scheduled payment."
+                    print(f"Monthly payment for {credit_account_id} (status: {credit_account.get('status')}) failed: {tx_reason}")
+                    payment_can_be_attempted = False # Markiere als nicht erfolgreich
+                    # Sperre Hauptkonto, falls nicht schon gesperrt
+                    if main_account.get('status') != 'blocked':
+                        main_account['status'] = 'blocked'
+                        print(f"Main account {main_account_id} status changed to 'blocked' due to failed credit payment.")
         
-        # Wenn das Kreditkonto 'active' oder 'blocked' war, war eine Zahlung fällig.
-        # Wenn sie nicht geleistet werden konnte (payment_can_be_attempted == False), dann missed_payment erhöhen.
-        if credit_account.get('status') in ['active', 'blocked'] and not payment_can_be_attempted:
-            current_missed_payments = 0
-            try:
-                current_missed_payments = int(credit_account.get('missed_payments_count', 0))
-            except (ValueError, TypeError):
-                print(f"Warning: could not convert missed_payments_count '{credit_account.get('missed_payments_count')}' to int for {credit_account_id}. Defaulting to 0.")
-            
-            credit_account['missed_payments_count'] = current_missed_payments + 1
-            credit_account['last_payment_attempt_date'] = current_date.isoformat()
-            # Wenn das Kreditkonto 'active' war, wird es jetzt 'blocked'
-            if credit_account.get('status') == 'active':
-                 credit_account['status'] = 'blocked' 
-                 print(f"Credit account {credit_account_id} status changed to 'blocked' due to missed payment.")
-
-        elif payment_can_be_attempted and credit_account.get('status') == 'active': # Zahlung erfolgreich für aktives Konto
-            tx_status = "completed"
+                # Wenn das Kreditkonto 'active' oder 'blocked' war, war eine Zahlung fällig.
+                # Wenn sie nicht geleistet werden konnte (payment_can_be_attempted == False), dann missed_payment erhöhen.
+                if credit_account.get('status') in ['active', 'blocked'] and not payment_can_be_attempted:
+                    credit_account['missed_payments_count'] = credit_account.get('missed_payments_count', 0) + 1
+                    credit_account['last_payment_attempt_date'] = current_date_iso
+                    # Wenn das Kreditkonto 'active' war, wird es jetzt 'blocked'
+                    if credit_account.get('status') == 'active':
+                         credit_account['status'] = 'blocked' 
+                         print(f"Credit account {credit_account_id} status changed to 'blocked' due to missed payment.")
+
+                elif payment_can_be_attempted and credit_account.get('status') == 'active': # Zahlung erfolgreich für aktives Konto
+                    tx_status = "completed"
             
-            interest_component = (credit_balance_before_payment * config.CREDIT_MONTHLY_RATE).quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
-            principal_component = (scheduled_monthly_payment - interest_component).quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
-
-            if principal_component < Decimal('0'):
-                # Dies sollte bei korrekter Amortisation nicht passieren, kann aber bei Restsalden auftreten
-                principal_component = scheduled_monthly_payment - interest_component # kann negativ sein, wenn Zins > Rate
-                if principal_component < Decimal('0'): # Wenn Zins allein schon höher ist als Rate
-                    interest_component = scheduled_monthly_payment # Gesamte Rate ist Zins
-                    principal_component = Decimal('0') # Kein Tilgungsanteil
+                    # Aufteilung in ganzen Rappen rechnen (alle Salden und Raten liegen auf Rappen),
+                    # Decimal-Objekte erst für Konto, Transaktion und Ledger erzeugen
+                    credit_balance_cents = to_cents(credit_balance_before_payment)
+                    payment_cents = to_cents(scheduled_monthly_payment)
+                    interest_cents, principal_cents = _compute_repayment_cents(credit_balance_cents, rate_num, rate_den, payment_cents)
+
+                    if principal_cents < 0:
+                        # Dies sollte bei korrekter Amortisation nicht passieren, kann aber bei Restsalden auftreten:
+                        # Zins allein ist schon höher als die Rate
+                        interest_cents, principal_cents = payment_cents, 0
+                        interest_component = scheduled_monthly_payment # Gesamte Rate ist Zins
+                        principal_component = Decimal('0') # Kein Tilgungsanteil
+                    else:
+                        interest_component = from_cents(interest_cents)
+                        principal_component = from_cents(principal_cents)
             
-            if principal_component > credit_balance_before_payment: # Letzte Zahlung
-                principal_component = credit_balance_before_payment
-                actual_payment_amount_for_tx = principal_component + interest_component
+                    actual_payment_cents = payment_cents
+                    if principal_cents > credit_balance_cents: # Letzte Zahlung
+                        principal_cents = credit_balance_cents
+                        principal_component = credit_balance_before_payment
+                        actual_payment_cents = principal_cents + interest_cents
+                        actual_payment_amount_for_tx = from_cents(actual_payment_cents)
             
-            final_main_balance = current_main_balance - actual_payment_amount_for_tx
-            main_account['balance'] = final_main_balance
+                    final_main_balance = from_cents(to_cents(current_main_balance) - actual_payment_cents)
+                    main_account['balance'] = final_main_balance
             
-            final_credit_balance = credit_balance_before_payment - principal_component
-            credit_account['balance'] = final_credit_balance
+                    final_credit_balance = from_cents(credit_balance_cents - principal_cents)
+                    credit_account['balance'] = final_credit_balance
             
-            credit_account['remaining_payments'] = max(0, remaining_payments_int - 1)
-            credit_account['missed_payments_count'] = 0 
-            credit_account['last_payment_attempt_date'] = current_date.isoformat()
+                    credit_account['remaining_payments'] = max(0, remaining_payments_int - 1)
+                    credit_account['missed_payments_count'] = 0 
+                    credit_account['last_payment_attempt_date'] = current_date_iso
             
-            if credit_account.get('status') == 'blocked':
-                 credit_account['status'] = 'active'
-                 print(f"Credit account {credit_account_id} status changed to 'active' due to successful payment.")
-
-            update_bank_ledger([
-                ('customer_liabilities', -actual_payment_amount_for_tx), 
-                ('credit_assets', -principal_component),       
-                ('income', +interest_component)                
-            ])
-            print(f"Monthly payment of {actual_payment_amount_for_tx} (P: {principal_component}, I: {interest_component}) processed for {credit_account_id}. Main acc new balance: {final_main_balance}")
-            processed_successful_count += 1
-
-        # Transaktionshistorie erstellen
-        repayment_tx = {
-            "transaction_id": repayment_tx_id,
-            "type": "credit_repayment",
-            "credit_account": credit_account_id,
-            "main_account": main_account_id,
-            "amount": actual_payment_amount_for_tx, # Der Betrag, der tatsächlich vom Hauptkonto abgebucht wurde/hätte werden sollen
-            "principal_amount": principal_component if tx_status == 'completed' else Decimal('0.00'),
-            "interest_amount": interest_component if tx_status == 'completed' else Decimal('0.00'),
-            "timestamp": current_date.isoformat(),
-            "status": tx_status,
-            "reason": tx_reason,
-            "credit_balance_before": credit_balance_before_payment,
-            "credit_balance_after": final_credit_balance, # Endgültiger Kreditsaldo
-            "account_balance_before": current_main_balance,
-            "account_balance_after": final_main_balance    # Endgültiger Hauptkontosaldo
-        }
-
-        # Transaktion zu beiden Konten hinzufügen (speichert die Konten)
-        if main_account : add_transaction_to_account(main_account, repayment_tx)
-        add_transaction_to_account(credit_account, repayment_tx) 
-
-        if credit_account['balance'] <= Decimal('0.00') and tx_status == 'completed':
-            credit_account['balance'] = Decimal('0.00')
-            if credit_account['status'] != 'paid_off':
-                credit_account['status'] = 'paid_off'
-                credit_account['remaining_payments'] = 0
-                print(f"Credit {credit_account_id} fully paid off.")
-                save_account(credit_account) # Sicherstellen, dass der paid_off Status gespeichert wird
-        else:
-            # Speichere credit_account, falls 'missed_payments_count' oder 'status' sich geändert hat, auch bei fehlgeschlagener Zahlung
-            save_account(credit_account)
-
+                    if credit_account.get('status') == 'blocked':
+                         credit_account['status'] = 'active'
+                         print(f"Credit account {credit_account_id} status changed to 'active' due to successful payment.")
+
+                    print(f"Monthly payment of {actual_payment_amount_for_tx} (P: {principal_component}, I: {interest_component}) processed for {credit_account_id}. Main acc new balance: {final_main_balance}")
+                    processed_successful_count += 1
+
+                # Transaktionshistorie erstellen
+                repayment_tx = {
+                    "transaction_id": repayment_tx_id,
+                    "type": "credit_repayment",
+                    "credit_account": credit_account_id,
+                    "main_account": main_account_id,
+                    "amount": actual_payment_amount_for_tx, # Der Betrag, der tatsächlich vom Hauptkonto abgebucht wurde/hätte werden sollen
+                    "principal_amount": principal_component if tx_status == 'completed' else _ZERO_DEC,
+                    "interest_amount": interest_component if tx_status == 'completed' else _ZERO_DEC,
+                    "timestamp": current_date_iso,
+                    "status": tx_status,
+                    "reason": tx_reason,
+                    "credit_balance_before": credit_balance_before_payment,
+                    "credit_balance_after": final_credit_balance, # Endgültiger Kreditsaldo
+                    "account_balance_before": current_main_balance,
+                    "account_balance_after": final_main_balance    # Endgültiger Hauptkontosaldo
+                }
+
+                # paid_off-Status vor dem Speichern setzen, damit jedes Konto nur einmal geschrieben wird
+                if credit_account['balance'] <= _ZERO_DEC and tx_status == 'completed':
+                    credit_account['balance'] = _ZERO_DEC
+                    if credit_account['status'] != 'paid_off':
+                        credit_account['status'] = 'paid_off'
+                        credit_account['remaining_payments'] = 0
+                        print(f"Credit {credit_account_id} fully paid off.")
+
+                # Transaktion zu beiden Konten hinzufügen (speichert die Konten, auch geänderte
+                # missed_payments_count/status bei fehlgeschlagener Zahlung)
+                if main_account : add_transaction_to_account(main_account, repayment_tx)
+                add_transaction_to_account(credit_account, repayment_tx) 
+
+                # Erst nach dem Speichern beider Konten für das Hauptbuch vormerken
+                if tx_status == 'completed':
+                    ledger_payments_cents += actual_payment_cents
+                    ledger_principal_cents += principal_cents
+                    ledger_interest_cents += interest_cents
+        finally:
+            # Hauptbuch einmal pro Lauf statt einmal pro Kreditzahlung aktualisieren
+            if ledger_payments_cents or ledger_principal_cents or ledger_interest_cents:
+                update_bank_ledger([
+                    ('customer_liabilities', -from_cents(ledger_payments_cents)),
+                    ('credit_assets', -from_cents(ledger_principal_cents)),
+                    ('income', +from_cents(ledger_interest_cents))
+                ])
 
     if payment_attempted_count == 0:
         print("No active credits found needing monthly payments for this period.")
@@ -539,74 +666,68 @@ def calculate_daily_penalties(current_date):
     Args:
         current_date (datetime): Aktuelles Systemdatum
     """
-    # Import hier, um zirkuläre Imports bei Bedarf zu handhaben (obwohl get_account ok sein sollte)
-    from .account_service import get_account, save_account 
+    chf_quantize = config.CHF_QUANTIZE
+    daily_penalty_rate = _DAILY_PENALTY_RATE
+    zero = _ZERO_DEC
+    # Datumsteil (YYYY-MM-DD) für den Vergleich mit last_penalty_calculation_date
+    current_date_prefix = current_date.date().isoformat()
+    current_date_iso = current_date.isoformat()
 
     print(f"\n--- Calculating Daily Penalties for {current_date.isoformat()} ---")
     penalties_calculated_count = 0
 
-    for filename in os.listdir(config.ACCOUNTS_DIR):
-        if not filename.startswith('CRCH-') or not filename.endswith('.json'):
-            continue
-
-        credit_account_id = filename[:-5]
-        credit_account = get_account(credit_account_id)
+    # Geänderte Kreditkonten (und Index) gesammelt am Ende des Laufs schreiben statt einzeln pro Konto
+    with batched_writes():
+        # Strafzinsen betreffen nur gesperrte Kredite: nur diese aus dem Kreditindex laden
+        # (Dateien parallel vorausgelesen, verarbeitet wird der Reihe nach)
+        for credit_account_id, credit_account in get_accounts(credit_index.iter_with_status('blocked')):
 
-        if not credit_account:
-            print(f"Warning: Could not load credit account {credit_account_id} in calculate_daily_penalties.")
-            continue
+            if not credit_account:
+                print(f"Warning: Could not load credit account {credit_account_id} in calculate_daily_penalties.")
+                continue
         
-        # DEBUG: Show initial state for this account in this run
-        print(f"DEBUG PENALTY: Processing {credit_account_id}, Status: {credit_account.get('status')}, Balance: {credit_account.get('balance')}, LastPenaltyDate: {credit_account.get('last_penalty_calculation_date')}, CurrentDateForPenalty: {current_date.isoformat()}")
-
-        if credit_account.get('status') != 'blocked':
-            continue
-
-        current_credit_balance = credit_account.get('balance', Decimal('0.00'))
-        # Sicherstellen, dass es Decimal ist (obwohl get_account dies tun sollte)
-        if not isinstance(current_credit_balance, Decimal):
-            current_credit_balance = Decimal(str(current_credit_balance))
-
-        if current_credit_balance <= Decimal('0.00'):
-            continue # Keine Strafzinsen auf Null- oder negativem Saldo
-
-        # Prüfen, ob für heute bereits Strafzinsen berechnet wurden
-        last_penalty_date_str = credit_account.get('last_penalty_calculation_date')
-        if last_penalty_date_str:
-            try:
-                # Nur das Datum vergleichen, ohne Zeitanteil, falls current_date Zeit hat
-                last_penalty_date = parse_datetime(last_penalty_date_str).date()
-                if last_penalty_date == current_date.date():
-                    # print(f"Daily penalty for {credit_account_id} already calculated on {last_penalty_date_str}. Skipping.")
-                    continue
-            except Exception as e:
-                print(f"Warning: Could not parse last_penalty_calculation_date '{last_penalty_date_str}' for {credit_account_id}: {e}")
+            # DEBUG: Show initial state for this account in this run (nur formatiert, wenn DEBUG aktiv ist)
+            log.debug("DEBUG PENALTY: Processing %s, Status: %s, Balance: %s, LastPenaltyDate: %s, CurrentDateForPenalty: %s",
+                      credit_account_id, credit_account.get('status'), credit_account.get('balance'),
+                      credit_account.get('last_penalty_calculation_date'), current_date_iso)
 
-        daily_penalty_rate = config.PENALTY_INTEREST_RATE_PA / Decimal('365')
-        # Berechne den Strafzinsbetrag und runde ihn korrekt
-        penalty_amount_today = (current_credit_balance * daily_penalty_rate).quantize(config.CHF_QUANTIZE, ROUND_HALF_UP)
+            if credit_account.get('status') != 'blocked':
+                continue
 
-        if penalty_amount_today > Decimal('0.00'):
-            accrued_penalties_before = credit_account.get('penalty_accrued', Decimal('0.00'))
-            if not isinstance(accrued_penalties_before, Decimal):
-                accrued_penalties_before = Decimal(str(accrued_penalties_before))
+            # Prüfen, ob für heute bereits Strafzinsen berechnet wurden (vor jeder Decimal-Arbeit):
+            # der gespeicherte ISO-Zeitstempel beginnt mit dem Datum, ein Stringvergleich genügt
+            last_penalty_date_str = credit_account.get('last_penalty_calculation_date')
+            if last_penalty_date_str and last_penalty_date_str[:10] == current_date_prefix:
+                continue
+
+            # Betragsfelder sind nach get_account bereits Decimal (siehe _account_object_hook)
+            current_credit_balance = credit_account.get('balance', zero)
+
+            if current_credit_balance <= zero:
+                continue # Keine Strafzinsen auf Null- oder negativem Saldo
+
+            # Berechne den Strafzinsbetrag und runde ihn korrekt
+            penalty_amount_today = (current_credit_balance * daily_penalty_rate).quantize(chf_quantize, ROUND_HALF_UP)
+
+            if penalty_amount_today > zero:
+                accrued_penalties_before = credit_account.get('penalty_accrued', zero)
             
-            new_total_accrued_penalties = accrued_penalties_before + penalty_amount_today
-            credit_account['penalty_accrued'] = new_total_accrued_penalties
-            credit_account['last_penalty_calculation_date'] = current_date.isoformat() # Nur Datumsteil wäre besser, aber ISO reicht für den Test
+                new_total_accrued_penalties = accrued_penalties_before + penalty_amount_today
+                credit_account['penalty_accrued'] = new_total_accrued_penalties
+                credit_account['last_penalty_calculation_date'] = current_date_iso # Nur Datumsteil wäre besser, aber ISO reicht für den Test
             
-            print(f"Daily penalty of {penalty_amount_today:.2f} accrued for {credit_account_id}. Balance: {current_credit_balance:.2f}, Old Accrued: {accrued_penalties_before:.2f}, New Total Accrued: {new_total_accrued_penalties:.2f}")
-            penalties_calculated_count += 1
+                print(f"Daily penalty of {penalty_amount_today:.2f} accrued for {credit_account_id}. Balance: {current_credit_balance:.2f}, Old Accrued: {accrued_penalties_before:.2f}, New Total Accrued: {new_total_accrued_penalties:.2f}")
+                penalties_calculated_count += 1
             
-            # Ledger Update für akkumulierte Strafzinsen (als Ertrag für die Bank und Erhöhung der Forderung)
-            # Dies sollte idealerweise beim Entsperren oder Abschreiben realisiert werden,
-            # aber hier zu loggen, dass die Forderung entsteht, ist auch eine Möglichkeit.
-            # update_bank_ledger([('income', penalty_amount_today), ('credit_assets_penalties', +penalty_amount_today)])
-            # Fürs Erste lassen wir das Ledger-Update hier weg, es wird beim Entsperrversuch/Abschreibung relevant.
+                # Ledger Update für akkumulierte Strafzinsen (als Ertrag für die Bank und Erhöhung der Forderung)
+                # Dies sollte idealerweise beim Entsperren oder Abschreiben realisiert werden,
+                # aber hier zu loggen, dass die Forderung entsteht, ist auch eine Möglichkeit.
+                # update_bank_ledger([('income', penalty_amount_today), ('credit_assets_penalties', +penalty_amount_today)])
+                # Fürs Erste lassen wir das Ledger-Update hier weg, es wird beim Entsperrversuch/Abschreibung relevant.
 
-            save_account(credit_account) # Speichere das Konto mit den aktualisierten Strafen
-        # else:
-            # print(f"Calculated penalty_amount for {credit_account_id} is {penalty_amount_today:.2f}, not accruing.")
+                save_account(credit_account) # Speichere das Konto mit den aktualisierten Strafen
+            # else:
+                # print(f"Calculated penalty_amount for {credit_account_id} is {penalty_amount_today:.2f}, not accruing.")
 
     if penalties_calculated_count == 0:
         print("No daily penalties were newly calculated in this run (either no eligible accounts or already calculated today).")
@@ -625,61 +746,78 @@ def write_off_bad_credits(current_date):
         - Schreibt Kredite ab und markiert sie als verloren
     """
     print(f"\n--- Processing Credit Write-offs for {current_date.isoformat()} ---")
-    # Import für get_account und save_account, falls noch nicht oben global genug
-    from .account_service import get_account, save_account
     written_off_count = 0
-
-    for filename in os.listdir(config.ACCOUNTS_DIR):
-        if not filename.startswith('CRCH-') or not filename.endswith('.json'):
-            continue
-        
-        credit_account_id = filename[:-5]
-        credit_account = get_account(credit_account_id) # Verwende get_account für korrekte Typen
-
-        if not credit_account:
-            print(f"Warning: Could not load credit account {credit_account_id} in write_off_bad_credits.")
-            continue
-            
-        # Sollte 'blocked' Konten für Abschreibung prüfen
-        if credit_account.get('status') != 'blocked':
-            continue
-        
-        missed_payments_val = credit_account.get('missed_payments_count', 0)
+    # Angaben zu den abgeschriebenen Krediten, werden am Ende als ein Log-Eintrag ausgegeben
+    written_off_log = []
+    # Ledger-Buchungen aller Abschreibungen sammeln und am Ende in einem einzigen Aufruf buchen
+    pending_ledger_updates = []
+    max_missed_payments = config.MAX_MISSED_PAYMENTS
+    zero = _ZERO_DEC
+    current_date_iso = current_date.isoformat()
+
+    # Kontodateien, Kreditindex und Hauptbuch der Abschreibungen gesammelt schreiben: die Dateien
+    # werden beim Verlassen des Blocks ersetzt und jedes Verzeichnis nur einmal synchronisiert
+    with batched_writes():
+        # Das Hauptbuch im finally buchen: batched_writes schreibt die vorgemerkten Konten auch
+        # bei einer Ausnahme, das Hauptbuch muss zu ihnen passen
         try:
-            missed_payments_int = int(missed_payments_val)
-        except (ValueError, TypeError):
-            print(f"Warning: Could not convert missed_payments '{missed_payments_val}' to int for {credit_account_id} in write_off. Defaulting to 0.")
-            missed_payments_int = 0
-                
-        # Prüfen ob zu viele Zahlungen verpasst wurden
-        if missed_payments_int >= config.MAX_MISSED_PAYMENTS:
-            balance_at_write_off = credit_account.get('balance', Decimal('0.00'))
-            penalties_at_write_off = credit_account.get('penalty_accrued', Decimal('0.00'))
-            total_loss = balance_at_write_off + penalties_at_write_off
-
-            credit_account['status'] = 'written_off'
-            credit_account['write_off_date'] = current_date.isoformat()
-            credit_account['balance_at_write_off'] = balance_at_write_off # Saldo zum Zeitpunkt der Abschreibung festhalten
-            credit_account['penalties_at_write_off'] = penalties_at_write_off
-            # Saldo und Strafzinsen auf Null setzen nach Abschreibung für die Bankbilanz intern?
-            # Oder den Saldo so lassen, um den Verlust zu dokumentieren? Aktuell bleibt er.
+            # Abgeschrieben werden nur gesperrte Kredite: nur diese aus dem Kreditindex laden statt
+            # alle Kreditkonten-Dateien zu lesen (Dateien parallel vorausgelesen, verarbeitet wird der Reihe nach).
+            # Reine Prüf-Lesezugriffe landen nicht im Konten-Zwischenspeicher; abgeschriebene Konten
+            # werden beim Speichern über save_account ohnehin aufgenommen
+            for credit_account_id, credit_account in get_accounts(credit_index.iter_with_status('blocked'), cache=False):
+
+                if not credit_account:
+                    print(f"Warning: Could not load credit account {credit_account_id} in write_off_bad_credits.")
+                    continue
             
-            print(f"Credit {credit_account_id} written off. Amount: {balance_at_write_off}, Penalties: {penalties_at_write_off}, Total Loss: {total_loss}")
-            written_off_count += 1
+                # Sollte 'blocked' Konten für Abschreibung prüfen
+                if credit_account.get('status') != 'blocked':
+                    continue
+        
+                # Zähler sind nach get_account bereits int (siehe _account_object_hook)
+                missed_payments_int = credit_account.get('missed_payments_count', 0)
+
+                # Prüfen ob zu viele Zahlungen verpasst wurden
+                if missed_payments_int >= max_missed_payments:
+                    # Beträge erst lesen, wenn der Kredit tatsächlich abgeschrieben wird
+                    balance_at_write_off = credit_account.get('balance', zero)
+                    penalties_at_write_off = credit_account.get('penalty_accrued', zero)
+                    total_loss = balance_at_write_off + penalties_at_write_off
+
+                    credit_account['status'] = 'written_off'
+                    credit_account['write_off_date'] = current_date_iso
+                    credit_account['balance_at_write_off'] = balance_at_write_off # Saldo zum Zeitpunkt der Abschreibung festhalten
+                    credit_account['penalties_at_write_off'] = penalties_at_write_off
+                    # Saldo und Strafzinsen auf Null setzen nach Abschreibung für die Bankbilanz intern?
+                    # Oder den Saldo so lassen, um den Verlust zu dokumentieren? Aktuell bleibt er.
             
-            # Ledger Update für Abschreibung
-            # Reduziere 'credit_assets' um den abgeschriebenen Betrag (Kapital)
-            # Erhöhe 'expenses' oder spezifisches 'credit_loss_expenses' Konto um den Totalverlust
-            # Reduziere 'income' oder 'credit_assets_penalties' um die abgeschriebenen Strafzinsen, da sie nicht realisiert wurden
-            update_bank_ledger([
-                ('credit_assets', -balance_at_write_off), # Reduziert den Wert der Kreditanlagen
-                ('income', -penalties_at_write_off), # Reduziert (ggf. negative) Einnahmen aus Strafzinsen, da uneinbringlich
-                ('credit_losses', +total_loss) # Erfasst den Verlust als Aufwand
-            ])
+                    written_off_log.append({'id': credit_account_id, 'balance': str(balance_at_write_off),
+                                            'penalties': str(penalties_at_write_off), 'total_loss': str(total_loss)})
+                    written_off_count += 1
             
-            save_account(credit_account)
+                    save_account(credit_account)
+
+                    # Ledger Update für Abschreibung (erst nach dem Speichern des Kontos vormerken)
+                    # Reduziere 'credit_assets' um den abgeschriebenen Betrag (Kapital)
+                    # Erhöhe 'expenses' oder spezifisches 'credit_loss_expenses' Konto um den Totalverlust
+                    # Reduziere 'income' oder 'credit_assets_penalties' um die abgeschriebenen Strafzinsen, da sie nicht realisiert wurden
+                    pending_ledger_updates.extend([
+                        ('credit_assets', -balance_at_write_off), # Reduziert den Wert der Kreditanlagen
+                        ('income', -penalties_at_write_off), # Reduziert (ggf. negative) Einnahmen aus Strafzinsen, da uneinbringlich
+                        ('credit_losses', +total_loss) # Erfasst den Verlust als Aufwand
+                    ])
+        finally:
+            # Hauptbuch einmal pro Lauf lesen und schreiben statt einmal pro abgeschriebenem Kredit
+            if pending_ledger_updates:
+                update_bank_ledger(pending_ledger_updates)
     
     if written_off_count > 0:
+        log.info("write_offs=%s", json.dumps(written_off_log))
+        # Eine Zusammenfassung auf der Konsole, damit die abgeschriebenen Kredite auch ohne
+        # konfiguriertes Logging sichtbar bleiben
+        print("Credits written off: " + ", ".join(
+            f"{entry['id']} (Total Loss: {entry['total_loss']})" for entry in written_off_log))
         print(f"--- {written_off_count} credit(s) written off ---")
     else:
         print("No credits met write-off criteria in this run.")
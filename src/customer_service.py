@@ -8,6 +8,10 @@ import json
 from . import config
 from .utils import generate_id, save_json, load_json
 
+# Zwischenspeicher bereits gelesener Kunden (customer_id -> Kundendaten)
+# Wird von create_customer/update_customer nachgeführt; nicht gefundene Kunden werden nicht gespeichert
+_customer_cache = {}
+
 def create_customer(name, address, birth_date_str):
     """
     Erstellt ein neues Kundenprofil und speichert es im System.
@@ -32,6 +36,7 @@ def create_customer(name, address, birth_date_str):
     }
     file_path = os.path.join(config.CUSTOMERS_DIR, f"{customer_id}.json")
     save_json(file_path, customer_data)
+    _customer_cache[customer_id] = dict(customer_data)
     print(f"Customer created: {customer_id}")
     return customer_data
 
@@ -61,6 +66,7 @@ def update_customer(customer_id, updates):
             print(f"Warning: Update key '{key}' not allowed or not found.")
 
     save_json(file_path, customer_data)
+    _customer_cache[customer_id] = dict(customer_data)
     print(f"Customer {customer_id} updated.")
     return customer_data
 
@@ -73,6 +79,15 @@ def get_customer(customer_id):
         
     Returns:
         dict/None: Kundendaten oder None wenn nicht gefunden
+        
+    Hinweis:
+        Wiederholte Abfragen werden aus dem Zwischenspeicher bedient (Rückgabe als Kopie)
     """
-    file_path = os.path.join(config.CUSTOMERS_DIR, f"{customer_id}.json")
-    return load_json(file_path)
\ No newline at end of file
+    customer_data = _customer_cache.get(customer_id)
+    if customer_data is None:
+        file_path = os.path.join(config.CUSTOMERS_DIR, f"{customer_id}.json")
+        customer_data = load_json(file_path)
+        if customer_data is None:
+            return None
+        _customer_cache[customer_id] = customer_data
+    return dict(customer_data)
\ No newline at end of file
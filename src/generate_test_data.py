@@ -6,6 +6,7 @@ import os
 import json
 import shutil
 from datetime import datetime, timedelta
+from pathlib import Path
 from decimal import Decimal, ROUND_HALF_UP
 import random
 from src.utils import generate_id, save_json, parse_datetime
@@ -244,8 +245,11 @@ def validate_test_data():
     print(f"Found {len(customer_files)} customers")
     
     # Check accounts
-    account_files = [f for f in os.listdir(config.ACCOUNTS_DIR) if not f.startswith('CR')]
-    credit_files = [f for f in os.listdir(config.ACCOUNTS_DIR) if f.startswith('CR')]
+    # Nur Kontodateien zählen, nicht die Transaktionslogs (*.tx.jsonl)
+    # Ein einziger Verzeichnisdurchlauf; Kreditkonten als Menge für die Paarprüfung unten
+    json_files = [path.name for path in Path(config.ACCOUNTS_DIR).glob('*.json')]
+    account_files = [f for f in json_files if not f.startswith('CR')]
+    credit_files = {f for f in json_files if f.startswith('CR')}
     print(f"Found {len(account_files)} regular accounts")
     print(f"Found {len(credit_files)} credit accounts")
     
@@ -6,7 +6,7 @@ from decimal import Decimal
 import os
 import json
 from datetime import datetime
-from . import config
+from . import config, credit_index
 from .utils import load_json, save_json
 
 def load_bank_ledger():
@@ -33,7 +33,7 @@ def load_bank_ledger():
             "income": {"balance": Decimal("0.00")},
             "credit_losses": {"balance": Decimal("0.00")}
         }
-        save_json(config.LEDGER_FILE, ledger)
+        save_json(config.LEDGER_FILE, ledger, durable=True)
     # Ensure balances are Decimal
     for key in ledger:
         if isinstance(ledger[key].get('balance'), str):
@@ -76,7 +76,7 @@ def update_bank_ledger(updates):
         ledger[account]["balance"] += amount
         total_change += amount
 
-    save_json(config.LEDGER_FILE, ledger)
+    save_json(config.LEDGER_FILE, ledger, durable=True)
     return ledger
 
 def get_bank_ledger():
@@ -105,6 +105,7 @@ def validate_bank_system():
         - Vergleicht Hauptbuch mit tatsächlichen Kontosalden
         - Berücksichtigt nur aktive und gesperrte Konten
         - Toleriert Rundungsdifferenzen bis CHF_QUANTIZE
+        - Gleicht den Kreditindex mit den Kreditkonten ab und baut ihn bei Abweichungen neu auf
     """
     print("\n--- Starting System Validation ---")
     ledger = load_bank_ledger()
@@ -112,22 +113,35 @@ def validate_bank_system():
     total_credit_outstanding = Decimal("0.00")
     active_accounts = 0
     active_credits = 0
+    # Tatsächlicher Stand der laufenden Kredite für den Abgleich mit dem Kreditindex
+    indexed_credits = {}
 
     # Sum balances from all customer accounts
-    all_files = os.listdir(config.ACCOUNTS_DIR)
-    account_files = [f for f in all_files if f.endswith('.json') and not f.startswith('CR')]
-    credit_files = [f for f in all_files if f.endswith('.json') and f.startswith('CR')]
-
-    for acc_file in account_files:
-        acc_data = load_json(os.path.join(config.ACCOUNTS_DIR, acc_file))
+    # Ein scandir-Durchlauf; DirEntry.path spart das erneute Zusammensetzen der Pfade
+    account_paths = []
+    credit_paths = []
+    with os.scandir(config.ACCOUNTS_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith('.json'):
+                continue
+            if name[0] == 'C' and name[1] == 'R':
+                credit_paths.append((name[:-5], entry.path))
+            else:
+                account_paths.append(entry.path)
+
+    for acc_path in account_paths:
+        acc_data = load_json(acc_path)
         if acc_data and acc_data.get('status') in ['active', 'blocked']:
             balance = acc_data.get('balance', '0')
             total_customer_balance += Decimal(balance) if isinstance(balance, str) else balance
             if acc_data.get('status') == 'active':
                 active_accounts += 1
 
-    for cred_file in credit_files:
-        cred_data = load_json(os.path.join(config.ACCOUNTS_DIR, cred_file))
+    for credit_account_id, cred_path in credit_paths:
+        cred_data = load_json(cred_path)
+        if cred_data and cred_data.get('status') in credit_index.ACTIVE_STATUSES:
+            indexed_credits[credit_account_id] = cred_data['status']
         if cred_data and cred_data.get('status') in ['active', 'blocked'] and Decimal(
                 cred_data.get('balance', '0')) > 0:
             balance = cred_data.get('balance', '0')
@@ -156,5 +170,8 @@ def validate_bank_system():
 
     print(f"Total Active/Blocked Accounts: {active_accounts}")
     print(f"Total Active/Blocked Credits: {active_credits}")
+    index_mismatches = credit_index.sync(indexed_credits)
+    if index_mismatches:
+        print(f"Credit Index: {index_mismatches} entr{'y' if index_mismatches == 1 else 'ies'} out of sync with credit accounts (REBUILT)")
     print("--- Validation Complete ---")
     return abs(customer_bal_diff) < config.CHF_QUANTIZE and abs(credit_bal_diff) < config.CHF_QUANTIZE and abs(diff) < config.CHF_QUANTIZE
\ No newline at end of file
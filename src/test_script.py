@@ -1,5 +1,5 @@
 from src.customer_service import create_customer
-from src.account_service import create_account, get_account, close_account, save_account
+from src.account_service import create_account, get_account, close_account, save_account, get_account_transactions
 from src.transaction_service import process_transfer_out, process_incoming_payment
 from src.credit_service import request_credit, process_manual_credit_repayment
 from src.time_processing_service import process_time_event
@@ -192,7 +192,8 @@ else:
         else:
             # Gab es einen Ablehnungsgrund in den Transaktionen des Hauptkontos?
             main_acc_after_event = get_account(acc1)
-            last_tx_main = main_acc_after_event['transactions'][-1] if main_acc_after_event['transactions'] else None
+            main_acc_transactions = get_account_transactions(acc1)
+            last_tx_main = main_acc_transactions[-1] if main_acc_transactions else None
             reason = "unknown"
             if last_tx_main and last_tx_main.get('type') == 'credit_repayment' and last_tx_main.get('status') == 'rejected':
                 reason = last_tx_main.get('reason', 'unknown')
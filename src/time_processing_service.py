@@ -3,12 +3,30 @@
 # Steuert die Simulation der Zeit und periodische Aufgaben
 
 from datetime import datetime
+from functools import lru_cache
 import os
 from . import config
 from .utils import load_json, save_json, parse_datetime
 from . import credit_service
 from . import account_service
 
+@lru_cache(maxsize=1)
+def _read_system_date_cached(file_version):
+    """
+    Liest das Systemdatum aus der Datei, zwischengespeichert pro Dateiversion.
+    
+    Args:
+        file_version (tuple): (st_mtime_ns, st_size) der Systemdatei als Cache-Schlüssel
+        
+    Returns:
+        datetime/None: Gespeichertes Systemdatum oder None falls ungültig
+    """
+    data = load_json(config.SYSTEM_DATE_FILE)
+    if data and 'current_date' in data:
+        # Ensure it's a datetime object
+        return datetime.fromisoformat(data['current_date'])
+    return None
+
 def get_system_date():
     """
     Lädt das aktuelle Systemdatum.
@@ -17,14 +35,17 @@ def get_system_date():
         datetime: Aktuelles Systemdatum
         
     Hinweis:
-        - Liest das Datum aus der Systemdatei
+        - Liest das Datum aus der Systemdatei, solange sich diese nicht ändert nur einmal (os.stat als Prüfung)
         - Initialisiert mit aktuellem Datum falls nicht vorhanden
         - Stellt sicher dass ein datetime-Objekt zurückgegeben wird
     """
-    data = load_json(config.SYSTEM_DATE_FILE)
-    if data and 'current_date' in data:
-        # Ensure it's a datetime object
-        return datetime.fromisoformat(data['current_date'])
+    try:
+        stat = os.stat(config.SYSTEM_DATE_FILE)
+        current_date = _read_system_date_cached((stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        current_date = None
+    if current_date is not None:
+        return current_date
     # Default to today if file doesn't exist or is invalid
     print("System date file not found or invalid, using current real time.")
     now = datetime.now()
@@ -53,6 +74,8 @@ def set_system_date(new_date):
         raise TypeError("new_date must be a datetime object or ISO format string")
 
     save_json(config.SYSTEM_DATE_FILE, {"current_date": new_date_str})
+    # Zwischengespeichertes Datum verwerfen (mtime-Auflösung reicht bei schnellen Folgeänderungen nicht)
+    _read_system_date_cached.cache_clear()
 
 def process_time_event(time_event_data):
     """
@@ -84,6 +107,9 @@ def process_time_event(time_event_data):
         print(f"Error processing time event: Invalid date format '{new_date_str}'. {e}")
         return
 
+    # Jedes Zeitereignis ist ein eigener Lauf: Konten neu von der Platte lesen
+    account_service.clear_account_cache()
+
     current_system_date = get_system_date()
     print(
         f"\n>>> Processing Time Event: Advancing system date from {current_system_date.isoformat()} to {new_date.isoformat()} <<<")
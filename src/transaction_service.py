@@ -7,7 +7,8 @@ from datetime import datetime
 import os
 from .config import CHF_QUANTIZE
 from .utils import load_json, generate_id, parse_datetime
-from .account_service import get_account, add_transaction_to_account, save_account, create_account, close_account
+from .account_service import (get_account, add_transaction_to_account, save_account, create_account, close_account,
+                              clear_account_cache)
 from .customer_service import create_customer
 from .credit_service import request_credit, process_manual_credit_repayment
 from .ledger_service import update_bank_ledger
@@ -168,7 +169,8 @@ def process_incoming_payment(transaction_data):
             credit_account = get_account(credit_account_id)
             
             if credit_account and credit_account.get('status') == 'blocked' and credit_account.get('penalty_accrued', Decimal('0.00')) > Decimal('0.00'):
-                accrued_penalties = Decimal(str(credit_account.get('penalty_accrued')))
+                # penalty_accrued ist nach get_account bereits Decimal (siehe _account_object_hook)
+                accrued_penalties = credit_account['penalty_accrued']
                 
                 # Transaktionsdaten für Strafzinszahlung vorbereiten
                 penalty_tx_id = generate_id("PENPAY")
@@ -322,6 +324,8 @@ def process_transaction_file(file_path):
         - Behandelt Fehler beim Dateizugriff und JSON-Parsing
     """
     print(f"\nProcessing transaction file: {file_path}")
+    # Jede Transaktionsdatei ist ein eigener Lauf: Konten neu von der Platte lesen
+    clear_account_cache()
     try:
         with open(file_path, 'r') as f:
             print(f"Successfully opened file: {file_path}")
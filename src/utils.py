@@ -3,13 +3,34 @@
 # Enthält Funktionen für Dateioperationen, ID-Generierung und Datumsverarbeitung
 # Stellt sicher, dass alle numerischen Werte als Decimal-Objekte behandelt werden
 
+import atexit
 import json
+import mmap
 import os
 import uuid
-from decimal import Decimal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime
 from . import config
 
+try:
+    import orjson  # Schneller C-Encoder, optional
+except ImportError:
+    orjson = None
+
+# Zustand für gebündelte Schreibvorgänge (siehe batched_writes)
+_batch_depth = 0  # Verschachtelungstiefe aktiver batched_writes-Blöcke
+_pending_writes = {}  # Dateipfad -> serialisierter JSON-Inhalt (bytes), wird beim Verlassen geschrieben
+_HAS_FADVISE = hasattr(os, 'posix_fadvise')  # Nur unter Linux/Unix verfügbar
+_MMAP_MIN_BYTES = 64 * 1024  # Ab dieser Grösse werden JSON-Lines-Dateien per mmap gelesen
+_durable_writes = set()  # Dateipfade aus _pending_writes, die beim Verlassen durable geschrieben werden
+_write_error_handlers = []  # Rückrufe für nicht geschriebene JSON-Dateien (siehe on_write_error)
+_json_line_writers = {}  # Dateipfad -> BufferedJsonWriter, nur innerhalb von batched_writes (siehe append_json_lines)
+_READ_WORKERS = 16  # Threads für iter_file_contents (reines Datei-I/O)
+_READ_SLICE = 256  # Dateien pro Auftrag an den Thread-Pool in iter_file_contents
+
 class DecimalEncoder(json.JSONEncoder):
     """
     Benutzerdefinierter JSON-Encoder für Decimal-Werte.
@@ -25,6 +46,68 @@ class DecimalEncoder(json.JSONEncoder):
             return str(obj)
         return super(DecimalEncoder, self).default(obj)
 
+# Encoder-Instanzen einmalig erzeugen statt bei jedem json.dumps-Aufruf (nur ohne orjson benutzt)
+_COMPACT_ENCODER = DecimalEncoder(separators=(',', ':'), ensure_ascii=False)
+_INDENT_ENCODER = DecimalEncoder(indent=2, ensure_ascii=False)
+
+# Decoder pro object_hook (None = ohne Hook), Zahlen werden direkt als Decimal geparst
+_decoders = {}
+
+def _decimal_loads(content, object_hook=None):
+    """
+    Parst JSON-Inhalt mit Decimal-Zahlen über einen wiederverwendeten Decoder.
+    
+    Args:
+        content (bytes/str): JSON-Inhalt (Bytes werden wie von json.loads dekodiert)
+        object_hook (callable): Optionaler Hook für jedes Objekt
+        
+    Returns:
+        Geparste Daten
+        
+    Hinweis:
+        Entspricht json.loads(content, parse_float=Decimal, parse_int=Decimal, object_hook=object_hook),
+        ohne bei jedem Aufruf einen neuen JSONDecoder zu erzeugen
+    """
+    decoder = _decoders.get(object_hook)
+    if decoder is None:
+        decoder = _decoders[object_hook] = json.JSONDecoder(parse_float=Decimal, parse_int=Decimal,
+                                                            object_hook=object_hook)
+    if not isinstance(content, str):
+        content = content.decode(json.detect_encoding(content), 'surrogatepass')
+    return decoder.decode(content)
+
+def _decimal_default(obj):
+    """
+    Serialisierungs-Hook für orjson: Decimal-Werte werden als String geschrieben (wie DecimalEncoder).
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dump_bytes(data, compact=False):
+    """
+    Serialisiert Daten als UTF-8-kodiertes JSON.
+    
+    Args:
+        data (dict): Zu serialisierende Daten
+        compact (bool): Ohne Einrückung und Leerzeichen schreiben
+        
+    Returns:
+        bytes: JSON-Inhalt
+        
+    Hinweis:
+        - Verwendet orjson falls installiert, sonst json mit DecimalEncoder
+        - Beide Varianten erzeugen dasselbe Format (2er-Einrückung bzw. kompakt, Decimal als String)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_decimal_default, option=option)
+    if compact:
+        return _COMPACT_ENCODER.encode(data).encode('utf-8')
+    return _INDENT_ENCODER.encode(data).encode('utf-8')
+
 def setup_directories():
     """
     Erstellt die notwendigen Datenverzeichnisse, falls sie nicht existieren.
@@ -39,51 +122,467 @@ def setup_directories():
     os.makedirs(os.path.dirname(config.LEDGER_FILE), exist_ok=True)
     print("Directories checked/created.")
 
-def load_json(file_path):
+def _plain_loads(content):
+    """
+    Parst JSON-Inhalt ohne Decimal-Umwandlung (Ganzzahlen als int, Kommazahlen als float).
+    
+    Hinweis:
+        Verwendet orjson falls installiert (deutlich schneller), sonst json
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def load_json(file_path, object_hook=None, drop_cache=False, decimal_numbers=True, content=None):
     """
     Lädt Daten aus einer JSON-Datei.
     
     Args:
         file_path (str): Pfad zur JSON-Datei
+        object_hook (callable): Optionaler Hook, den der Decoder für jedes Objekt aufruft
+                                (nur mit decimal_numbers=True)
+        drop_cache (bool): Dem Kernel mitteilen, dass die Dateiseiten nicht mehr gebraucht werden
+                           (für einmalige Durchläufe über viele Dateien)
+        decimal_numbers (bool): Zahlen als Decimal parsen; False für Dateien, deren Beträge als
+                                String gespeichert sind (schneller, dann über orjson)
+        content (bytes): Bereits gelesener Dateiinhalt (z.B. aus iter_file_contents);
+                         die Datei wird dann nicht erneut geöffnet
         
     Returns:
         dict/None: Geladene Daten oder None bei Fehler
         
     Hinweis:
-        - Konvertiert alle numerischen Werte in Decimal-Objekte
+        - Konvertiert standardmässig alle numerischen Werte in Decimal-Objekte
         - Behandelt Fehler beim Dateizugriff und JSON-Parsing
-        - Verwendet UTF-8 Kodierung
+        - Liest Bytes, die Kodierung wird wie bei json.loads erkannt
+        - Für Decimal-Zahlen bleibt es beim json-Parser, da nur dieser sie direkt liefern kann
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            # Konvertiert numerische Strings in Decimal-Objekte
-            return json.load(f, parse_float=Decimal, parse_int=Decimal)
-    except FileNotFoundError:
-        return None
+        if file_path in _pending_writes:
+            # Noch nicht geschriebener Stand aus einem batched_writes-Block
+            content = _pending_writes[file_path]
+        elif content is None:
+            content = _read_file(file_path, drop_cache)
+            if content is None:
+                return None
+        if not decimal_numbers:
+            return _plain_loads(content)
+        # Konvertiert numerische Strings in Decimal-Objekte
+        return _decimal_loads(content, object_hook)
     except json.JSONDecodeError:
         print(f"Error decoding JSON from {file_path}")
         return None
 
-def save_json(file_path, data):
+def _read_file(file_path, drop_cache=False):
+    """
+    Liest eine Datei als bytes (None, wenn sie nicht existiert).
+    
+    Hinweis:
+        drop_cache wie bei load_json
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+            if drop_cache and _HAS_FADVISE:
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                except OSError:
+                    pass
+        return content
+    except FileNotFoundError:
+        return None
+
+def _read_file_slice(file_paths, drop_cache):
+    """Liest einen Abschnitt für iter_file_contents nacheinander (ein Auftrag im Thread-Pool)."""
+    return [_read_file(file_path, drop_cache) for file_path in file_paths]
+
+def iter_file_contents(file_paths, drop_cache=False):
+    """
+    Liest viele Dateien parallel im Thread-Pool voraus.
+    
+    Args:
+        file_paths (list): Pfade der zu lesenden Dateien
+        drop_cache (bool): Wie bei load_json
+        
+    Yields:
+        bytes/None: Dateiinhalte in der Reihenfolge von file_paths (None für fehlende Dateien)
+        
+    Hinweis:
+        - Die Threads öffnen und lesen nur (der GIL ist dabei freigegeben) und teilen keinen
+          veränderbaren Zustand; geparst wird im aufrufenden Thread (load_json mit content)
+        - Die Pfade werden in Abschnitten zu _READ_SLICE Dateien verteilt: ein Auftrag pro Datei
+          kostet mehr Verwaltungsaufwand, als das Lesen einer kleinen Kontodatei einspart
+        - Es sind höchstens zwei Abschnitte pro Thread im Voraus gelesen, der Speicherbedarf
+          hängt damit nicht von der Anzahl Dateien ab
+        - Noch nicht geschriebene Inhalte aus batched_writes sieht nur load_json; es bevorzugt
+          sie gegenüber dem hier gelesenen Stand
+    """
+    slices = (file_paths[start:start + _READ_SLICE] for start in range(0, len(file_paths), _READ_SLICE))
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+        queued = deque(executor.submit(_read_file_slice, part, drop_cache)
+                       for _, part in zip(range(2 * _READ_WORKERS), slices))
+        while queued:
+            contents = queued.popleft().result()
+            part = next(slices, None)
+            if part is not None:
+                queued.append(executor.submit(_read_file_slice, part, drop_cache))
+            yield from contents
+
+def _write_file(file_path, content, durable=False, sync_directory=True):
+    """
+    Schreibt einen serialisierten Dateiinhalt.
+    
+    Args:
+        file_path (str): Zieldatei
+        content (bytes): Dateiinhalt
+        durable (bool): Über temporäre Datei, fsync und os.replace schreiben
+        sync_directory (bool): Bei durable=True auch das Verzeichnis synchronisieren
+        
+    Hinweis:
+        - Ohne durable wird nur geschrieben und geschlossen, kein fsync
+        - Mit durable ist die Datei nach der Rückkehr vollständig auf dem Datenträger,
+          und ein Absturz hinterlässt nie eine halb geschriebene Datei
+    """
+    if not durable:
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        return
+
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+    if sync_directory:
+        _fsync_directory(os.path.dirname(file_path))
+
+def save_json(file_path, data, compact=False, durable=False):
     """
     Speichert Daten in einer JSON-Datei.
     
     Args:
         file_path (str): Pfad zur JSON-Datei
         data (dict): Zu speichernde Daten
+        compact (bool): Ohne Einrückung schreiben (kleinere Dateien, schnelleres Parsen)
+        durable (bool): Mit fsync und atomarem Ersetzen schreiben (nur für kritische Dateien wie das Hauptbuch)
+        
+    Returns:
+        bool: True wenn geschrieben (bzw. in batched_writes vorgemerkt), False bei Fehler
         
     Hinweis:
         - Erstellt Verzeichnisse falls nicht vorhanden
-        - Verwendet DecimalEncoder für korrekte Serialisierung
-        - Speichert mit UTF-8 Kodierung und Einrückung
-        - Behandelt Fehler beim Speichern
+        - Serialisiert über _dump_bytes (orjson falls verfügbar)
+        - Speichert mit UTF-8 Kodierung und Einrückung (ausser compact=True)
+        - Behandelt Fehler beim Speichern und meldet sie an die Rückrufe aus on_write_error
+        - Innerhalb von batched_writes wird nur im Speicher vorgemerkt; schlägt das Schreiben
+          beim Verlassen des Blocks fehl, wird ebenfalls über on_write_error gemeldet
     """
+    if _batch_depth > 0:
+        try:
+            _pending_writes[file_path] = _dump_bytes(data, compact)
+            if durable:
+                _durable_writes.add(file_path)
+        except Exception as e:
+            print(f"Error saving JSON to {file_path}: {e}")
+            _report_write_error(file_path)
+            return False
+        return True
+
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, cls=DecimalEncoder, indent=2, ensure_ascii=False)
+        _write_file(file_path, _dump_bytes(data, compact), durable)
     except Exception as e:
         print(f"Error saving JSON to {file_path}: {e}")
+        _report_write_error(file_path)
+        return False
+    return True
+
+def on_write_error(handler):
+    """
+    Registriert einen Rückruf für JSON-Dateien, die nicht geschrieben werden konnten.
+    
+    Args:
+        handler (callable): Wird mit dem Dateipfad aufgerufen
+        
+    Hinweis:
+        Für Zwischenspeicher, die sonst einen nie geschriebenen Stand als gespeichert ansehen
+        würden (siehe account_service._account_cache)
+    """
+    _write_error_handlers.append(handler)
+
+def _report_write_error(file_path):
+    """Ruft die über on_write_error registrierten Rückrufe für eine nicht geschriebene Datei auf."""
+    for handler in _write_error_handlers:
+        handler(file_path)
+
+class BufferedJsonWriter:
+    """
+    Sammelt anzuhängende JSON-Zeilen für eine Datei im Speicher und schreibt sie gebündelt.
+    
+    Hinweis:
+        - commit() hängt den Puffer mit einem einzigen open/write/close an die Datei an
+        - Erreicht der Puffer SOFT_MAX_BYTES, wird automatisch geschrieben; schlägt das fehl,
+          bleiben die Zeilen im Puffer und werden beim nächsten commit() erneut geschrieben
+        - Nach einer Spitze (z.B. Übernahme einer langen Alt-Historie) wird der Puffer neu angelegt,
+          damit kein grosser Speicherblock dauerhaft belegt bleibt
+        - Die Datei wird nicht offen gehalten, um bei vielen Konten keine Dateihandles zu binden
+    """
+    SOFT_MAX_BYTES = 128 * 1024
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._buffer = bytearray()
+
+    def write(self, content):
+        """
+        Fügt bereits serialisierte Zeilen zum Puffer hinzu.
+        
+        Hinweis:
+            Die Zeilen sind danach in jedem Fall vorgemerkt, auch wenn das automatische Schreiben
+            fehlschlägt; der Aufrufer darf sie deshalb nicht ein zweites Mal übergeben
+        """
+        self._buffer.extend(content)
+        if len(self._buffer) >= self.SOFT_MAX_BYTES:
+            self.commit()
+
+    def commit(self):
+        """
+        Schreibt den Pufferinhalt an das Dateiende.
+        
+        Returns:
+            bool: True bei Erfolg, False bei Fehler (der Puffer bleibt dann erhalten)
+        """
+        if not self._buffer:
+            return True
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        try:
+            with open(self.file_path, 'ab') as f:
+                f.write(self._buffer)
+        except Exception as e:
+            print(f"Error appending JSON lines to {self.file_path}: {e}")
+            return False
+        if len(self._buffer) > self.SOFT_MAX_BYTES:
+            self._buffer = bytearray()
+        else:
+            del self._buffer[:]
+        return True
+
+def flush_json_lines():
+    """
+    Schreibt alle gepufferten JSON-Zeilen auf die Festplatte.
+    
+    Returns:
+        set: Verzeichnisse, in die geschrieben wurde
+        
+    Hinweis:
+        - Wird beim Verlassen von batched_writes und beim Programmende automatisch aufgerufen
+        - Erfolgreich geschriebene Writer werden entfernt, nur fehlgeschlagene bleiben für
+          einen weiteren Versuch erhalten
+    """
+    directories = set()
+    for file_path, writer in list(_json_line_writers.items()):
+        had_content = bool(writer._buffer)
+        if writer.commit():
+            del _json_line_writers[file_path]
+            if had_content:
+                directories.add(os.path.dirname(file_path))
+    return directories
+
+atexit.register(flush_json_lines)
+
+def append_json_lines(file_path, records):
+    """
+    Hängt Datensätze als JSON-Zeilen (eine Zeile pro Datensatz) an eine Datei an.
+    
+    Args:
+        file_path (str): Pfad zur JSON-Lines-Datei
+        records (list): Anzuhängende Datensätze
+        
+    Returns:
+        bool: True bei Erfolg, False bei Fehler
+        
+    Hinweis:
+        - Reines Anhängen, bestehender Inhalt wird nie neu geschrieben
+        - Ausserhalb von batched_writes wird sofort geschrieben, damit die Historie nie hinter
+          dem bereits gespeicherten Kontostand zurückbleibt
+        - Innerhalb von batched_writes werden die Zeilen über einen BufferedJsonWriter gepuffert
+          und zusammen mit den übrigen Dateien des Blocks geschrieben (siehe flush_json_lines)
+    """
+    try:
+        content = b''.join(_dump_bytes(record, compact=True) + b'\n' for record in records)
+    except Exception as e:
+        print(f"Error appending JSON lines to {file_path}: {e}")
+        return False
+
+    if _batch_depth == 0:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        try:
+            with open(file_path, 'ab') as f:
+                f.write(content)
+        except Exception as e:
+            print(f"Error appending JSON lines to {file_path}: {e}")
+            return False
+        return True
+
+    writer = _json_line_writers.get(file_path)
+    if writer is None:
+        writer = _json_line_writers[file_path] = BufferedJsonWriter(file_path)
+    writer.write(content)
+    return True
+
+def load_json_lines(file_path):
+    """
+    Lädt alle Datensätze aus einer JSON-Lines-Datei.
+    
+    Args:
+        file_path (str): Pfad zur JSON-Lines-Datei
+        
+    Returns:
+        list: Geladene Datensätze (leer wenn die Datei nicht existiert)
+        
+    Hinweis:
+        - Konvertiert alle numerischen Werte in Decimal-Objekte
+        - Schreibt gepufferte Zeilen dieser Datei vor dem Lesen
+        - Unlesbare Zeilen werden mit Warnung übersprungen
+    """
+    writer = _json_line_writers.get(file_path)
+    if writer is not None and writer.commit():
+        del _json_line_writers[file_path]
+
+    records = []
+    for line in _iter_file_lines(file_path):
+        if not line.strip():
+            continue
+        try:
+            records.append(_decimal_loads(line))
+        except json.JSONDecodeError:
+            print(f"Warning: Skipping unreadable line in {file_path}")
+    return records
+
+def _iter_file_lines(file_path):
+    """
+    Liefert die Zeilen einer Datei als bytes.
+    
+    Hinweis:
+        - Grosse Dateien werden per mmap gelesen: die Seiten kommen direkt aus dem Page-Cache,
+          und es wird nie der ganze Inhalt zusätzlich als ein bytes-Objekt gehalten
+        - Kleine Dateien werden normal gelesen (mmap lohnt sich dort nicht)
+        - Eine fehlende Datei liefert keine Zeilen
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _MMAP_MIN_BYTES:
+                yield from f.read().splitlines()
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                line = mm.readline()
+                while line:
+                    yield line
+                    line = mm.readline()
+    except FileNotFoundError:
+        return
+
+def _fsync_directory(dir_path):
+    """
+    Synchronisiert einen Verzeichniseintrag auf den Datenträger.
+    
+    Args:
+        dir_path (str): Pfad zum Verzeichnis
+        
+    Hinweis:
+        Auf Plattformen ohne Verzeichnis-fsync (z.B. Windows) wird nichts getan
+    """
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextmanager
+def batched_writes():
+    """
+    Bündelt alle save_json-Aufrufe innerhalb des Blocks zu einem Schreibvorgang.
+    
+    Hinweis:
+        - save_json merkt die Daten nur im Speicher vor, load_json liest den vorgemerkten Stand
+        - Gepufferte JSON-Zeilen (append_json_lines) werden beim Verlassen ebenfalls geschrieben
+        - Beim Verlassen werden alle Dateien nacheinander geschrieben (durable-Dateien mit fsync)
+          und jedes betroffene Verzeichnis einmal synchronisiert
+        - Verschachtelte Blöcke schreiben erst beim Verlassen des äussersten Blocks
+    """
+    global _batch_depth
+    _batch_depth += 1
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+        if _batch_depth == 0:
+            pending = list(_pending_writes.items())
+            durable_paths = set(_durable_writes)
+            _pending_writes.clear()
+            _durable_writes.clear()
+            directories = set()
+            for file_path, content in pending:
+                directory = os.path.dirname(file_path)
+                if directory not in directories:
+                    os.makedirs(directory, exist_ok=True)
+                    directories.add(directory)
+                try:
+                    # Verzeichnisse werden unten einmal gesammelt synchronisiert
+                    _write_file(file_path, content, file_path in durable_paths, sync_directory=False)
+                except Exception as e:
+                    print(f"Error saving JSON to {file_path}: {e}")
+                    _report_write_error(file_path)
+            directories |= flush_json_lines()
+            for directory in directories:
+                _fsync_directory(directory)
+
+def to_cents(amount):
+    """
+    Wandelt einen CHF-Betrag in ganze Rappen um.
+    
+    Args:
+        amount (Decimal/str/int): Betrag in CHF
+        
+    Returns:
+        int: Betrag in Rappen (kaufmännisch auf 2 Stellen gerundet)
+    """
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int(amount.quantize(config.CHF_QUANTIZE, ROUND_HALF_UP).scaleb(2))
+
+def from_cents(cents):
+    """
+    Wandelt ganze Rappen zurück in einen CHF-Betrag.
+    
+    Args:
+        cents (int): Betrag in Rappen
+        
+    Returns:
+        Decimal: Betrag in CHF mit 2 Dezimalstellen
+    """
+    return Decimal(format_chf(cents))
+
+def format_chf(cents):
+    """
+    Formatiert einen Betrag in Rappen für die Ausgabe (z.B. 2500 -> '25.00').
+    
+    Args:
+        cents (int): Betrag in Rappen
+        
+    Returns:
+        str: Betrag mit 2 Dezimalstellen
+    """
+    sign = '-' if cents < 0 else ''
+    francs, rappen = divmod(abs(cents), 100)
+    return f"{sign}{francs}.{rappen:02d}"
 
 def generate_id(prefix):
     """
@@ -107,6 +606,26 @@ def generate_id(prefix):
     unique_part = str(uuid.uuid4())
     return f"{prefix}-{unique_part}"
 
+def reserve_ids(prefix, count):
+    """
+    Generiert einen Block eindeutiger IDs mit Präfix für Massendurchläufe.
+    
+    Args:
+        prefix (str): Präfix für die IDs (wie bei generate_id)
+        count (int): Anzahl benötigter IDs
+        
+    Returns:
+        list: IDs im Format 'prefix-uuid' wie bei generate_id
+        
+    Hinweis:
+        - Nur eine UUID4 pro Block: die ersten 20 Hex-Stellen stammen aus ihr,
+          die letzten 12 sind ein fortlaufender Zähler innerhalb des Blocks
+        - Für Schleifen über viele Konten (z.B. Gebühren- und Kreditläufe), die sonst
+          pro Konto eine eigene UUID erzeugen würden
+    """
+    base = str(uuid.uuid4())[:24]
+    return [f"{prefix}-{base}{i:012x}" for i in range(count)]
+
 def parse_datetime(dt_str):
     """
     Konvertiert einen ISO-Datumsstring in ein datetime-Objekt.